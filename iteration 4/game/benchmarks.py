@@ -0,0 +1,335 @@
+"""
+Reproducible stress scenarios for tracking simulation performance.
+
+Each scenario builds a game state through game_core.GameCore (headless, SDL
+dummy driver), warms up, then times a fixed number of frames. Time is split
+per subsystem (physics, collision, ai, world, render, other) by wrapping the
+relevant functions for the duration of the run.
+
+    python benchmarks.py                                  # run all, compare with bench_baseline.json
+    python benchmarks.py --scenario giant_enemy_collision --frames 60
+    python benchmarks.py --baseline other_machine.json --threshold 0.25
+    python benchmarks.py --no-baseline                    # just measure
+
+Results are written to bench_results.json. The run is compared against a
+baseline (by default bench_baseline.json next to this script) and exits with
+status 1 if any scenario's frame time or subsystem time is more than
+--threshold (fractional) slower than it.
+
+Timings depend on the machine, so the committed baseline is only a reference.
+After a deliberate performance change, or to compare on your own machine,
+regenerate it with all scenarios at the default frame count:
+
+    python benchmarks.py --no-baseline --save-baseline bench_baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from game_core import GameCore
+
+FRAME_DT = 1.0 / 60.0
+WARMUP_FRAMES = 10
+NOISE_FLOOR_MS = 0.25  # Differences smaller than this never count as regressions
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+SUBSYSTEMS = ("physics", "collision", "ai", "world", "render")
+
+
+class SubsystemTimer:
+    """Accumulates exclusive wall time per subsystem by wrapping functions.
+
+    Nested wrapped calls are charged to the innermost subsystem only, so the
+    per-subsystem totals add up to the frame time (the rest is "other").
+    """
+
+    def __init__(self):
+        self.totals = {name: 0.0 for name in SUBSYSTEMS}
+        self._stack = []
+        self._patches = []
+
+    def wrap(self, owner, attr, subsystem):
+        original = getattr(owner, attr)
+        timer = self
+
+        def timed(*args, **kwargs):
+            timer._enter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                timer._exit(subsystem)
+
+        self._patches.append((owner, attr, owner.__dict__.get(attr, _MISSING)))
+        setattr(owner, attr, timed)
+
+    def restore(self):
+        for owner, attr, original in reversed(self._patches):
+            if original is _MISSING:
+                delattr(owner, attr)
+            else:
+                setattr(owner, attr, original)
+        self._patches = []
+
+    def reset(self):
+        for name in self.totals:
+            self.totals[name] = 0.0
+
+    def _enter(self):
+        now = time.perf_counter()
+        if self._stack:
+            self._stack[-1][1] += now - self._stack[-1][0]
+        self._stack.append([now, 0.0])
+
+    def _exit(self, subsystem):
+        now = time.perf_counter()
+        start, inner_exclusive = self._stack.pop()
+        self.totals[subsystem] += inner_exclusive + (now - start)
+        if self._stack:
+            self._stack[-1][0] = now
+
+
+_MISSING = object()
+
+
+def instrument(timer, game):
+    """Wrap the hot entry points of each subsystem"""
+    import entity
+    import physics
+    import player
+    import virus
+    import world_generation
+
+    timer.wrap(physics.PhysicsWorld, "step", "physics")
+    timer.wrap(entity.CollisionSystem, "detect_and_resolve_collisions", "collision")
+    timer.wrap(entity.SoftBody, "resolve_polygon_collisions", "collision")
+    for cls in (entity.Cell, entity.EnemyCell, player.PlayerCell):
+        timer.wrap(cls, "update", "ai")
+    for cls in (entity.Cell,):
+        timer.wrap(cls, "update_targeting", "ai")
+        timer.wrap(cls, "update_protein_abilities", "ai")
+    for cls in (virus.Virus, virus.CapsidVirus, virus.FilamentousVirus, virus.PhageVirus):
+        if "update" in cls.__dict__:
+            timer.wrap(cls, "update", "ai")
+    timer.wrap(world_generation.WorldMap, "update", "world")
+    timer.wrap(game, "process_poi_spawns", "world")
+    timer.wrap(game, "spawn_procedural_enemies", "world")
+    timer.wrap(game, "render_game", "render")
+
+
+# ---- scenarios ----
+def _player(core):
+    return core.player_cells[0]
+
+
+def setup_split_colony(core, cells=16):
+    """One large player cell split repeatedly until the colony has `cells` members"""
+    from player import PlayerCell
+
+    game = core.game
+    big = PlayerCell(_player(core).center, points=96, radius=320)
+    game.physics_world.remove_bodies(game.player_cells)
+    game.player_cells[:] = [big]
+    game.physics_world.add_bodies([big])
+    while len(game.player_cells) < cells:
+        # main.update_game_systems performs a split when two split points are selected
+        target = max(game.player_cells, key=lambda c: len(c.points))
+        if len(target.points) < 6:
+            break
+        target.split_points = [target.points[0], target.points[len(target.points) // 2]]
+        core.step(FRAME_DT)
+
+
+def setup_virus_cluster(core, count=20):
+    """A virus_cluster point of interest with `count` viruses in the chunk beside the player"""
+    from virus import CapsidVirus
+
+    generator = core.world_map.world_generator
+    cx, cy = generator.get_chunk_coords(_player(core).center)
+    # One chunk over, so the viruses converge on the player instead of killing it during the run
+    chunk = generator.get_chunk(cx + 1, cy)
+    chunk.poi_type = "virus_cluster"
+    chunk.poi_data = {"virus_type": CapsidVirus, "cluster_count": count}
+    if hasattr(chunk, "_poi_spawned"):
+        del chunk._poi_spawned
+    chunk.spawn_poi_entities()
+    core.game.process_poi_spawns()
+
+
+def setup_giant_enemy_collision(core):
+    """A 50-point giant enemy plus three radius-150 enemies overlapping the player"""
+    from entity import EnemyCell
+    from molecule import Lipid
+
+    game = core.game
+    center = _player(core).center
+    giant = EnemyCell(center + (250, 0), points=50, radius=500, membrane_molecule=Lipid)
+    game.enemy_cells.append(giant)
+    game.sprites.append(giant)
+    game.physics_world.add_bodies([giant])
+    for offset in ((-200, 150), (-200, -150), (0, 300)):
+        game.spawn_enemy_cell(center + offset)
+
+
+def setup_scattered_enemies(core, rows=6, columns=8, spacing=450):
+    """A grid of rows x columns enemy cells around the player, far enough apart that few touch"""
+    center = _player(core).center
+    for row in range(rows):
+        for column in range(columns):
+            offset = ((column - columns / 2) * spacing, (row - rows / 2) * spacing)
+            if abs(offset[0]) < spacing and abs(offset[1]) < spacing:
+                continue  # Leave the player room
+            core.game.spawn_enemy_cell(center + offset)
+
+
+def setup_molecules_10k(core, total=10000):
+    """10,000 molecules spread over discovered chunks around the player"""
+    from molecule import MOLECULE_KINDS
+    from world_generation import ChunkState
+
+    generator = core.world_map.world_generator
+    chunks = generator.get_chunks_in_range(_player(core).center, 5)
+    for chunk in chunks:
+        chunk.state = ChunkState.DISCOVERED
+    have = sum(len(chunk.molecules) for chunk in chunks)
+    for i in range(max(0, total - have)):
+        chunk = chunks[i % len(chunks)]
+        rect = chunk.world_rect
+        x, y = random.randint(rect.left + 10, rect.right - 10), random.randint(rect.top + 10, rect.bottom - 10)
+        chunk.molecules.add(x, y, random.choice(MOLECULE_KINDS), random.randint(1, 3))
+
+
+def setup_explored_map_2000(core, count=2000):
+    """A map with about 2,000 generated and discovered chunks"""
+    from world_generation import ChunkState
+
+    generator = core.world_map.world_generator
+    side = int(count ** 0.5) + 1
+    cx, cy = generator.get_chunk_coords(_player(core).center)
+    made = 0
+    for dx in range(-side // 2, side - side // 2):
+        for dy in range(-side // 2, side - side // 2):
+            if made >= count:
+                break
+            chunk = generator.get_chunk(cx + dx, cy + dy)
+            if chunk.state == ChunkState.UNDISCOVERED:
+                chunk.state = ChunkState.DISCOVERED
+            made += 1
+
+
+SCENARIOS = {
+    "split_colony": setup_split_colony,
+    "virus_cluster": setup_virus_cluster,
+    "giant_enemy_collision": setup_giant_enemy_collision,
+    "scattered_enemies": setup_scattered_enemies,
+    "molecules_10k": setup_molecules_10k,
+    "explored_map_2000": setup_explored_map_2000,
+}
+
+
+def run_scenario(name, frames, seed, render=True):
+    """Build one scenario and time `frames` frames; returns its result dict"""
+    random.seed(seed)
+    core = GameCore(mode="singleplayer", seed=seed, render=render)
+    SCENARIOS[name](core)
+    for _ in range(WARMUP_FRAMES):
+        core.step(FRAME_DT)
+
+    timer = SubsystemTimer()
+    instrument(timer, core.game)
+    frame_times = []
+    try:
+        for _ in range(frames):
+            start = time.perf_counter()
+            core.step(FRAME_DT)
+            frame_times.append(time.perf_counter() - start)
+    finally:
+        timer.restore()
+
+    total = sum(frame_times)
+    subsystems = {key: value * 1000.0 / frames for key, value in timer.totals.items()}
+    subsystems["other"] = max(0.0, total * 1000.0 / frames - sum(subsystems.values()))
+    ordered = sorted(frame_times)
+    return {
+        "frames": frames,
+        "frame_ms": total * 1000.0 / frames,
+        "frame_p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000.0,
+        "subsystems_ms": subsystems,
+        "entities": core.summary(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """List of human-readable regressions of results against baseline"""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        metrics = [("frame_ms", current["frame_ms"], base["frame_ms"])]
+        for key, value in current["subsystems_ms"].items():
+            if key in base.get("subsystems_ms", {}):
+                metrics.append((key, value, base["subsystems_ms"][key]))
+        for metric, value, reference in metrics:
+            if value - reference > NOISE_FLOOR_MS and value > reference * (1.0 + threshold):
+                regressions.append(f"{name}.{metric}: {value:.2f} ms vs baseline {reference:.2f} ms "
+                                   f"(+{(value / reference - 1.0) * 100 if reference else float('inf'):.0f}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the performance scenarios")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run (repeatable; default all)")
+    parser.add_argument("--frames", type=int, default=120, help="measured frames per scenario")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--no-render", action="store_true", help="skip drawing (render time will be 0)")
+    parser.add_argument("--output", default="bench_results.json", help="where to write results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="baseline JSON to compare against (default: bench_baseline.json beside this script)")
+    parser.add_argument("--no-baseline", action="store_true", help="skip the baseline comparison")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="also write the results as a new baseline")
+    args = parser.parse_args(argv)
+
+    names = args.scenario or list(SCENARIOS)
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "frames": args.frames,
+            "seed": args.seed,
+            "render": not args.no_render,
+        },
+        "scenarios": {},
+    }
+    for name in names:
+        result = run_scenario(name, args.frames, args.seed, render=not args.no_render)
+        results["scenarios"][name] = result
+        parts = ", ".join(f"{k} {v:.2f}" for k, v in result["subsystems_ms"].items())
+        print(f"{name:24s} {result['frame_ms']:7.2f} ms/frame (p95 {result['frame_p95_ms']:.2f})  [{parts}]")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline and not args.no_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("Performance regressions:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print("No regressions against", args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,56 @@
+import numpy as np
 import pygame
+from sprites import quantize_zoom, scaled_sprite
 
 class Camera:
     def __init__(self, pos, zoom=1.0):
         self.pos = pygame.Vector2(pos)
         self.zoom = zoom
+        self.viewport = None  # (width, height) of the surface being drawn, cached by begin_frame
+        self.screen_center = None  # Vector2 center of that surface
+
+    def begin_frame(self, surface=None):
+        """Cache the viewport size and screen center used by this frame's conversions"""
+        surface = surface or pygame.display.get_surface()
+        self.viewport = surface.get_size()
+        self.screen_center = pygame.Vector2(self.viewport[0] // 2, self.viewport[1] // 2)
 
     def world_to_screen(self, world_pos):
-        return (world_pos - self.pos) * self.zoom + pygame.Vector2(self.get_screen_center())
+        return (world_pos - self.pos) * self.zoom + self._center()
 
     def screen_to_world(self, screen_pos):
-        return (pygame.Vector2(screen_pos) - pygame.Vector2(self.get_screen_center())) / self.zoom + self.pos
+        return (pygame.Vector2(screen_pos) - self._center()) / self.zoom + self.pos
+
+    def world_to_screen_array(self, world_points):
+        """Screen positions of an (n, 2) array of world positions, as an (n, 2) float array"""
+        center = self._center()
+        points = np.asarray(world_points, dtype=float).reshape(-1, 2)
+        return (points - (self.pos.x, self.pos.y)) * self.zoom + (center.x, center.y)
+
+    def visible_mask(self, screen_points, margin=0.0):
+        """Boolean mask of the (n, 2) screen positions inside the viewport grown by margin pixels"""
+        self._center()
+        width, height = self.viewport
+        xs, ys = screen_points[:, 0], screen_points[:, 1]
+        return (xs >= -margin) & (xs < width + margin) & (ys >= -margin) & (ys < height + margin)
+
+    def rect_visible(self, left, top, right, bottom, margin=0.0):
+        """Whether a screen-space box (e.g. of a polygon) overlaps the viewport grown by margin pixels"""
+        self._center()
+        width, height = self.viewport
+        return right >= -margin and left < width + margin and bottom >= -margin and top < height + margin
 
     def get_screen_center(self):
-        surface = pygame.display.get_surface()
-        return (surface.get_width() // 2, surface.get_height() // 2)
+        center = self._center()
+        return (int(center.x), int(center.y))
+
+    def _center(self):
+        if self.screen_center is None:
+            self.begin_frame()
+        return self.screen_center
 
     def apply_zoom(self, surface):
+        """surface scaled by the (quantized) zoom; cached, so treat the result as read-only"""
+        zoom = quantize_zoom(self.zoom)
         size = surface.get_size()
-        return pygame.transform.smoothscale(surface, (int(size[0] * self.zoom), int(size[1] * self.zoom)))
\ No newline at end of file
+        return scaled_sprite(surface, (int(size[0] * zoom), int(size[1] * zoom)), smooth=True)
\ No newline at end of file
@@ -96,6 +96,29 @@ RESONANCE_SHIELD_ABSORPTION = 50  # Absorbs this much damage before breaking
 
 # Spring Physics Constants
 SPRING_MAX_STRETCH_MULTIPLIER = 3.0  # Maximum stretch = rest_length * this multiplier
+PHYSICS_BACKEND = "numpy"  # "numpy" (vectorized arrays in physics.py) or "python" (per-Point objects)
+PHYSICS_TIMESTEP = 1.0 / 60.0  # Fixed physics step in seconds, independent of the render frame rate
+PHYSICS_SUBSTEPS = 1  # Sub-steps per fixed step (raise for stiffer springs)
+PHYSICS_MAX_STEPS_PER_FRAME = 5  # Catch-up cap; simulation time beyond this is dropped after a slow frame
+PHYSICS_INTERPOLATE = True  # Blend the last two physics states when drawing
+PHYSICS_LOD_RADIUS = 2500  # Cells further than this from every player cell and the camera simulate at reduced rate
+PHYSICS_LOD_INTERVAL = 3  # Far cells step (and run AI) once every this many steps/frames
+PHYSICS_SLEEP_SPEED = 2.0  # Cells whose centre moves slower than this (units/second) count as resting
+PHYSICS_SLEEP_DELAY = 1.5  # Seconds a cell must rest before it falls asleep
+PHYSICS_WAKE_DISTANCE = 1.0  # A sleeping cell displaced further than this wakes up
+PHYSICS_WAKE_MARGIN = 30.0  # A sleeping cell whose bounding box comes this close to an awake cell wakes up
+PHYSICS_COLLISION_MARGIN = 16.0  # Cells whose bounding boxes are further apart than twice this skip the collision pass
+PROFILER_ENABLED = True  # Record per-scope frame timings (profiler.py); cheap, the overlay is toggled with F3
+PROFILER_HISTORY = 600  # Frames kept in the profiler's ring buffer
+PROFILER_EXPORT_DIR = "profiles"  # Where F4 / Shift+F4 write frame timings
+SAMPLER_INTERVAL = 0.005  # Seconds between stack samples of the sampling profiler (F5)
+SAMPLER_FRAME_BUCKETS = (16.7, 33.3, 50.0)  # Frame-time edges (ms) the samples are grouped by
+SAMPLER_MAX_DEPTH = 64  # Deepest stack recorded per sample
+BACKGROUND_ZOOM_STEP = 0.01  # Zoom is rounded to this step before scaling the background tile
+BACKGROUND_PREWARM_ZOOMS = (1.0, 0.75, 0.5)  # Scaled when a game starts (solo zoom and common group zooms)
+SPRITE_ZOOM_STEP = 0.05  # Zoom is rounded to this step before scaling molecule and protein sprites
+SPRITE_BRIGHTNESS_STEP = 0.02  # Molecule and cell glow brightness is rounded to this step before picking a sprite
+SPRITE_CACHE_BYTES = 32 * 1024 * 1024  # Pixel memory of cached scaled sprites and background tiles (least recently used dropped first)
 
 ORGANELLE_DATA = {
     'Universal': [
@@ -673,6 +696,10 @@ CELL_VIEW_RANGE = 1  # radius of chunks that cells can view
 MAP_SIZE = (1000000, 1000000)  # total world size in pixels
 RENDER_DISTANCE = 5  # radius of chunks to render around player
 CHUNK_SIZE = (1000, 1000)  # size of each chunk in pixels
+CHUNK_WORKERS = 2  # background threads generating chunk contents
+CHUNK_PREFETCH_SECONDS = 2.0  # how far ahead (in seconds of travel) chunks are generated along a cell's velocity
+CHUNK_MEMORY_BUDGET = 32 * 1024 * 1024  # approximate bytes of generated chunks kept before far ones are evicted
+BIOME_TILE_CHUNKS = 32  # side (in chunks) of the cached biome tiles, each filled by one batched noise evaluation
 WORLD_BOUNDS = (1000000, 1000000)  # actual playable world bounds
 
 # Biome Configuration
@@ -2,6 +2,7 @@ import pygame
 import math
 import random
 from math import cos, sin, pi
+import numpy as np
 from config import (
     SCREEN_HEIGHT, SCREEN_WIDTH, FPS, CELL_RADIUS, LIPID_COUNT, MINT, GOLDEN, REDDISH_GRAY,
     STRENGTH_DAMAGE_MULTIPLIER, ENDURANCE_FLAT_REDUCTION, ENDURANCE_PERCENT_REDUCTION,
@@ -16,7 +17,11 @@ from config import (
     TARGET_KEEP_DISTANCE, TARGET_DISTANCE_TOLERANCE, TARGET_APPROACH_SPEED,
     CELL_ROTATION_SPEED
 )
+from config import PHYSICS_BACKEND
 from upgrade import Upgrade
+from physics import VectorField, ScalarField, TrackedList
+from sprites import shared_image, quantize_zoom, scaled_sprite
+import physics
 #from molecule import Lipid
 
 pygame.init()
@@ -75,6 +80,13 @@ def calculate_incoming_damage(raw_damage, attacker, defender):
     
     return max(1, damage_after_reduction), combat_info  # Minimum 1 damage
 
+
+def _default_entity_image():
+    surf = pygame.Surface((40, 40))
+    surf.fill((200, 200, 200))
+    return surf
+
+
 class Entity:
     def __init__(self, pos):
         self.pos = pygame.Vector2(pos)
@@ -89,11 +101,18 @@ class Entity:
         surface.blit(self.get_image(), self.get_image().get_rect(center=screen_pos))
 
     def get_image(self):
-        surf = pygame.Surface((40, 40))
-        surf.fill((200, 200, 200))
-        return surf
+        return shared_image("entity", _default_entity_image)
 
 class Point(Entity):
+    # Physics state; these become views into physics.engine arrays while the
+    # point's body is attached to the NumPy backend
+    pos = VectorField()
+    old_pos = VectorField()
+    force = VectorField()
+    mass = ScalarField()
+    _store = None
+    _slot = -1
+
     def __init__(self, pos, parent=None):
         super().__init__(pos)
         self.old_pos = self.pos.copy()
@@ -106,7 +125,15 @@ class Point(Entity):
         self.upgrade = None  # Store reference to represented upgrade
         self.is_visual = False  # Flag to mark if this point represents an upgrade
         self.radius = 10
-        self.image = self.get_image()
+        self._image = None  # Private image (upgrade icon); None uses the shared get_image()
+
+    @property
+    def image(self):
+        return self._image if self._image is not None else self.get_image()
+
+    @image.setter
+    def image(self, value):
+        self._image = value
 
     def set_upgrade(self, upgrade):
         """Set this point to represent a specific upgrade"""
@@ -259,9 +286,9 @@ class Point(Entity):
             # Draw protein point with icon
             if hasattr(self, 'image') and self.image:
                 # Scale image based on zoom while maintaining minimum size
-                scale = max(0.4, camera.zoom)
+                scale = max(0.4, quantize_zoom(camera.zoom))
                 scaled_size = int(20 * scale)  # Base size of 20 pixels
-                img = pygame.transform.scale(self.image, (scaled_size, scaled_size))
+                img = scaled_sprite(self.image, (scaled_size, scaled_size))
                 img_rect = img.get_rect(center=screen_pos)
                 surface.blit(img, img_rect)
                 # Draw outline for visibility (red if collision detected)
@@ -273,6 +300,11 @@ class Point(Entity):
             pygame.draw.circle(surface, collision_color, screen_pos, point_size)
 
 class Spring(Entity):
+    rest_length = ScalarField("rest")
+    spring_constant = ScalarField("k")
+    _store = None
+    _slot = -1
+
     def __init__(self, point1, point2, rest_length, spring_constant):
         self.point1 = point1
         self.point2 = point2
@@ -389,16 +421,45 @@ class ExternalSpring(Entity):
 
 
 class CollisionSystem:
+    """Point/spring collisions between cells using a persistent spatial hash.
+
+    Every membrane point and spring gets an integer index when its cell is first
+    seen. Buckets hold sets of those indices and are only touched when a point
+    (or a spring's covered range) crosses a cell boundary, so a mostly static
+    scene costs a vectorized key comparison rather than a full rebuild. Pairs
+    are visited once each by only testing point i against points j > i.
+    Given broadphase cell pairs, only buckets holding points of those cells
+    are searched.
+    """
+
+    NO_CELL = np.iinfo(np.int64).min  # Bucket key of an index that is not in the grid
+
     def __init__(self, cell_size=50):
         self.cell_size = cell_size
-        self.grid = {}
-        
+        self.reach = int(20 // cell_size) + 1  # Neighbouring buckets searched around a point
+        self.clear()
+
     def clear(self):
-        self.grid = {}
-    
+        self.grid = {}  # (cx, cy) -> set of point indices
+        self.spring_grid = {}  # (cx, cy) -> set of spring indices
+        self.points = []  # point index -> Point (None when free)
+        self.point_owner = []  # point index -> owning body serial
+        self.springs = []  # spring index -> Spring (None when free)
+        self.spring_owner = []
+        self.free_points = []
+        self.free_springs = []
+        self.point_cell = np.full((64, 2), self.NO_CELL, dtype=np.int64)
+        self.spring_ends = np.zeros((64, 2), dtype=np.intp)  # Point indices of each spring's endpoints
+        self.spring_range = np.full((64, 4), self.NO_CELL, dtype=np.int64)  # min cx, max cx, min cy, max cy
+        self._bodies = {}  # id(body) -> _CollisionBody
+        self._serial = 0
+        self._body_order = []
+        self._point_order = np.zeros(0, dtype=np.intp)
+        self._spring_order = np.zeros(0, dtype=np.intp)
+
     def _get_cell(self, pos):
         return (int(pos.x // self.cell_size), int(pos.y // self.cell_size))
-    
+
     def _get_nearby_cells(self, pos, radius):
         center_cell = self._get_cell(pos)
         cells = []
@@ -407,35 +468,164 @@ class CollisionSystem:
             for dy in range(-cell_radius, cell_radius + 1):
                 cells.append((center_cell[0] + dx, center_cell[1] + dy))
         return cells
-    
-    def add_point(self, point):
-        cell = self._get_cell(point.pos)
-        if cell not in self.grid:
-            self.grid[cell] = {'points': [], 'springs': []}
-        self.grid[cell]['points'].append(point)
-    
-    def add_spring(self, spring):
-        p1 = spring.point1.pos
-        p2 = spring.point2.pos
-        
-        min_x = min(p1.x, p2.x)
-        max_x = max(p1.x, p2.x)
-        min_y = min(p1.y, p2.y)
-        max_y = max(p1.y, p2.y)
-        
-        min_cell_x = int(min_x // self.cell_size)
-        max_cell_x = int(max_x // self.cell_size)
-        min_cell_y = int(min_y // self.cell_size)
-        max_cell_y = int(max_y // self.cell_size)
-        
-        for cell_x in range(min_cell_x, max_cell_x + 1):
-            for cell_y in range(min_cell_y, max_cell_y + 1):
-                cell = (cell_x, cell_y)
-                if cell not in self.grid:
-                    self.grid[cell] = {'points': [], 'springs': []}
-                if spring not in self.grid[cell]['springs']:
-                    self.grid[cell]['springs'].append(spring)
-    
+
+    # ---- index bookkeeping ----
+    def _new_point(self, point, owner):
+        if self.free_points:
+            index = self.free_points.pop()
+            self.points[index] = point
+            self.point_owner[index] = owner
+        else:
+            index = len(self.points)
+            self.points.append(point)
+            self.point_owner.append(owner)
+            if index >= len(self.point_cell):
+                grown = np.full((len(self.point_cell) * 2, 2), self.NO_CELL, dtype=np.int64)
+                grown[:index] = self.point_cell
+                self.point_cell = grown
+        return index
+
+    def _new_spring(self, spring, owner):
+        if self.free_springs:
+            index = self.free_springs.pop()
+            self.springs[index] = spring
+            self.spring_owner[index] = owner
+        else:
+            index = len(self.springs)
+            self.springs.append(spring)
+            self.spring_owner.append(owner)
+            if index >= len(self.spring_range):
+                size = len(self.spring_range) * 2
+                ends = np.zeros((size, 2), dtype=np.intp)
+                ends[:index] = self.spring_ends
+                ranges = np.full((size, 4), self.NO_CELL, dtype=np.int64)
+                ranges[:index] = self.spring_range
+                self.spring_ends, self.spring_range = ends, ranges
+        return index
+
+    def _register(self, body):
+        self._serial += 1
+        owner = self._serial
+        point_indices = [self._new_point(p, owner) for p in body.points]
+        local = {id(p): i for p, i in zip(body.points, point_indices)}
+        spring_indices = []
+        for spring in body.springs:
+            a = local.get(id(spring.point1))
+            b = local.get(id(spring.point2))
+            if a is None or b is None:
+                continue
+            index = self._new_spring(spring, owner)
+            self.spring_ends[index] = (a, b)
+            spring_indices.append(index)
+        return _CollisionBody(body, point_indices, spring_indices)
+
+    def _unregister(self, entry):
+        for index in entry.point_indices:
+            key = self.point_cell[index]
+            if key[0] != self.NO_CELL:
+                self._discard(self.grid, (int(key[0]), int(key[1])), index)
+            self.point_cell[index] = self.NO_CELL
+            self.points[index] = None
+            self.free_points.append(index)
+        for index in entry.spring_indices:
+            self._move_spring(index, self.spring_range[index], None)
+            self.spring_range[index] = self.NO_CELL
+            self.springs[index] = None
+            self.free_springs.append(index)
+
+    def _sync(self, softbodies):
+        """Register new bodies, drop vanished ones, re-index edited ones"""
+        changed = [id(b) for b in softbodies] != self._body_order
+        seen = set()
+        for body in softbodies:
+            entry = self._bodies.get(id(body))
+            if entry is not None and entry.body is body and entry.version == body._topology_version:
+                seen.add(id(body))
+                continue
+            if entry is not None:
+                self._unregister(entry)
+            entry = self._register(body)
+            entry.version = body._topology_version
+            self._bodies[id(body)] = entry
+            seen.add(id(body))
+            changed = True
+        for key in [k for k in self._bodies if k not in seen]:
+            self._unregister(self._bodies.pop(key))
+            changed = True
+        if changed:
+            self._body_order = [id(b) for b in softbodies]
+            entries = [self._bodies[id(b)] for b in softbodies]
+            self._point_order = np.array([i for e in entries for i in e.point_indices], dtype=np.intp)
+            self._spring_order = np.array([i for e in entries for i in e.spring_indices], dtype=np.intp)
+
+    @staticmethod
+    def _positions(softbodies):
+        """Current point positions of all bodies, concatenated in body order"""
+        chunks = [body.point_array() for body in softbodies if body.points]
+        if not chunks:
+            return np.zeros((0, 2))
+        return np.concatenate(chunks)
+
+    @staticmethod
+    def _discard(grid, key, index):
+        bucket = grid[key]
+        bucket.discard(index)
+        if not bucket:
+            del grid[key]
+
+    def _move_spring(self, index, old, new):
+        grid = self.spring_grid
+        if old is not None and old[0] != self.NO_CELL:
+            for cx in range(int(old[0]), int(old[1]) + 1):
+                for cy in range(int(old[2]), int(old[3]) + 1):
+                    self._discard(grid, (cx, cy), index)
+        if new is not None:
+            for cx in range(int(new[0]), int(new[1]) + 1):
+                for cy in range(int(new[2]), int(new[3]) + 1):
+                    bucket = grid.get((cx, cy))
+                    if bucket is None:
+                        bucket = grid[(cx, cy)] = set()
+                    bucket.add(index)
+
+    def _update_buckets(self, positions):
+        """Move only the points and springs whose bucket changed; returns index-aligned x, y lists"""
+        order = self._point_order
+        keys = np.floor_divide(positions, self.cell_size).astype(np.int64)
+        old = self.point_cell[order]
+        grid = self.grid
+        for m in np.nonzero((keys != old).any(axis=1))[0].tolist():
+            index = int(order[m])
+            if old[m, 0] != self.NO_CELL:
+                self._discard(grid, (int(old[m, 0]), int(old[m, 1])), index)
+            key = (int(keys[m, 0]), int(keys[m, 1]))
+            bucket = grid.get(key)
+            if bucket is None:
+                bucket = grid[key] = set()
+            bucket.add(index)
+        self.point_cell[order] = keys
+
+        springs = self._spring_order
+        if len(springs):
+            ends = self.spring_ends[springs]
+            a = self.point_cell[ends[:, 0]]
+            b = self.point_cell[ends[:, 1]]
+            ranges = np.empty((len(springs), 4), dtype=np.int64)
+            ranges[:, 0] = np.minimum(a[:, 0], b[:, 0])
+            ranges[:, 1] = np.maximum(a[:, 0], b[:, 0])
+            ranges[:, 2] = np.minimum(a[:, 1], b[:, 1])
+            ranges[:, 3] = np.maximum(a[:, 1], b[:, 1])
+            old_ranges = self.spring_range[springs]
+            for m in np.nonzero((ranges != old_ranges).any(axis=1))[0].tolist():
+                self._move_spring(int(springs[m]), old_ranges[m], ranges[m])
+            self.spring_range[springs] = ranges
+
+        x = np.zeros(len(self.points))
+        y = np.zeros(len(self.points))
+        x[order] = positions[:, 0]
+        y[order] = positions[:, 1]
+        return x.tolist(), y.tolist()
+
+    # ---- narrowphase ----
     def point_to_point_collision(self, point1, point2, collision_distance=16):
         if point1.parent == point2.parent:
             return
@@ -494,38 +684,95 @@ class CollisionSystem:
                     spring.point1.force -= response_force * (1 - t)
                     spring.point2.force -= response_force * t
     
-    def detect_and_resolve_collisions(self, softbodies):
-        self.clear()
-        
-        for sb in softbodies:
-            for point in sb.points:
-                self.add_point(point)
-            for spring in sb.springs:
-                self.add_spring(spring)
-        
-        checked_pairs = set()
-        for sb in softbodies:
-            for point in sb.points:
-                cells = self._get_nearby_cells(point.pos, 20)
-                
-                for cell in cells:
-                    if cell not in self.grid:
+    def detect_and_resolve_collisions(self, softbodies, point_distance=16, spring_distance=8, pairs=None):
+        self._sync(softbodies)
+        if not len(self._point_order):
+            return
+        x, y = self._update_buckets(self._positions(softbodies))
+        if pairs is None:
+            cells = self.grid.items()
+        else:
+            # Only the buckets of cells the broadphase paired up can hold a collision
+            paired = {id(body) for pair in pairs for body in pair}
+            indices = [i for key in paired for i in self._bodies[key].point_indices]
+            if not indices:
+                return
+            wanted = set(map(tuple, self.point_cell[indices].tolist()))
+            cells = [(key, members) for key, members in self.grid.items() if key in wanted]
+
+        points = self.points
+        springs = self.springs
+        point_owner = self.point_owner
+        spring_owner = self.spring_owner
+        spring_ends = self.spring_ends.tolist()
+        # Positions only pre-filter candidates (with slack for corrections made
+        # earlier in this pass); the resolvers re-check against live positions
+        point_reach = (point_distance * 1.5) ** 2
+        spring_slack = spring_distance * 1.5
+        reach = range(-self.reach, self.reach + 1)
+
+        for (cx, cy), members in cells:
+            near_points = []
+            near_springs = set()
+            for dx in reach:
+                for dy in reach:
+                    bucket = self.grid.get((cx + dx, cy + dy))
+                    if bucket:
+                        near_points.extend(bucket)
+                    bucket = self.spring_grid.get((cx + dx, cy + dy))
+                    if bucket:
+                        near_springs.update(bucket)
+            owners = {point_owner[j] for j in near_points}
+            owners.update(spring_owner[s] for s in near_springs)
+            if len(owners) < 2:
+                continue  # Only one cell around here
+
+            for i in members:
+                owner = point_owner[i]
+                xi = x[i]
+                yi = y[i]
+                for j in near_points:
+                    if j <= i or point_owner[j] == owner:
                         continue
-                    
-                    for other_point in self.grid[cell]['points']:
-                        pair = tuple(sorted([id(point), id(other_point)]))
-                        if pair not in checked_pairs:
-                            checked_pairs.add(pair)
-                            self.point_to_point_collision(point, other_point)
-                    
-                    for spring in self.grid[cell]['springs']:
-                        if point not in [spring.point1, spring.point2]:
-                            self.point_to_spring_collision(point, spring)
+                    dx = x[j] - xi
+                    dy = y[j] - yi
+                    if dx * dx + dy * dy < point_reach:
+                        self.point_to_point_collision(points[i], points[j], point_distance)
+
+                for s in near_springs:
+                    if spring_owner[s] == owner:
+                        continue
+                    a, b = spring_ends[s]
+                    if (min(x[a], x[b]) - spring_slack < xi < max(x[a], x[b]) + spring_slack and
+                            min(y[a], y[b]) - spring_slack < yi < max(y[a], y[b]) + spring_slack):
+                        self.point_to_spring_collision(points[i], springs[s], spring_distance)
+
+
+class _CollisionBody:
+    """CollisionSystem's record of one registered SoftBody"""
+
+    def __init__(self, body, point_indices, spring_indices):
+        self.body = body
+        self.point_indices = point_indices
+        self.spring_indices = spring_indices
+        self.version = 0
 
 
 class SoftBody(Entity):
     def __init__(self, pos, points, radius, membrane_molecule=None):
         super().__init__(pos)
+        self._physics = None  # physics.BodyHandle when using the NumPy backend
+        self._physics_dirty = True
+        self._world = None  # physics.PhysicsWorld stepping this body, if any
+        self._topology_version = 0  # Bumped whenever points/springs are added, removed or replaced
+        # Level-of-detail / sleep state managed by physics.PhysicsWorld
+        self._asleep = False
+        self._rest_time = 0.0
+        self._sleep_anchor = None
+        self._lod_far = False
+        self._lod_phase = 0
+        self._lod_time = 0.0
+        self._lod_frames = 0
         self.center = pygame.Vector2(pos)
         self.angle = 0.0
         self.ang_vel = 0.0
@@ -555,6 +802,42 @@ class SoftBody(Entity):
         self.initial_shape = self.calculate_shape()
         self.rest_area = self.calculate_area()
         self.inertia = self.compute_polygon_moi(self.initial_shape, self.mass)
+        self.aabb = (pos[0], pos[1], pos[0], pos[1])  # (min_x, min_y, max_x, max_y) of the membrane
+        self.update_aabb()
+
+        if PHYSICS_BACKEND == "numpy":
+            self._physics = physics.engine.attach(self)
+
+    # Points, springs and rest shape are tracked so the physics backend only
+    # re-indexes a body after its topology actually changes
+    @property
+    def points(self):
+        return self._points
+
+    @points.setter
+    def points(self, value):
+        self._points = TrackedList(self, value)
+        self._physics_dirty = True
+        self._topology_version += 1
+
+    @property
+    def springs(self):
+        return self._springs
+
+    @springs.setter
+    def springs(self, value):
+        self._springs = TrackedList(self, value)
+        self._physics_dirty = True
+        self._topology_version += 1
+
+    @property
+    def initial_shape(self):
+        return self._initial_shape
+
+    @initial_shape.setter
+    def initial_shape(self, value):
+        self._initial_shape = value
+        self._physics_dirty = True
 
     def clear_split_selection(self):
         """Clear all split point selections and reset colors"""
@@ -646,9 +929,21 @@ class SoftBody(Entity):
             p.pos = self.initial_shape[i] + vector
 
     def update(self, surface, events, delta_time, camera=None):
-        # Handle point input (but don't let them drag points around)
-        for p in self.points:
-            p.update(surface, events, delta_time, camera=camera)
+        # Handle point input (but don't let them drag points around).
+        # Points only react to events on player cells, so skip the walk otherwise.
+        if events and self.is_player:
+            for p in self.points:
+                p.update(surface, events, delta_time, camera=camera)
+
+        # Bodies owned by a PhysicsWorld are integrated in its batched step
+        if self._world is None:
+            self.step_physics(delta_time)
+
+    def step_physics(self, delta_time):
+        """Advance springs, Verlet integration and shape matching by delta_time"""
+        if self._physics is not None:
+            self._physics.step(self, delta_time)
+            return
 
         # Update center of mass
         com = self.calculate_com()
@@ -675,7 +970,7 @@ class SoftBody(Entity):
 
         # Update springs
         for s in self.springs:
-            s.update(surface, events, delta_time)
+            s.update(None, None, delta_time)
 
         # Perform Verlet integration for all points
         for p in self.points:
@@ -696,6 +991,28 @@ class SoftBody(Entity):
         for p in self.points:
             p.force = pygame.Vector2(0, 0)
 
+        self.update_aabb()
+
+    def wake(self):
+        """Bring a sleeping body back into full simulation"""
+        self._asleep = False
+        self._rest_time = 0.0
+
+    def point_array(self):
+        """Membrane point positions as an (n, 2) NumPy array"""
+        handle = self._physics
+        if handle is not None and not self._physics_dirty:
+            return handle.engine.points.pos[handle.point_slots]
+        return np.array([(p.pos.x, p.pos.y) for p in self.points], dtype=float).reshape(-1, 2)
+
+    def update_aabb(self):
+        """Recompute the membrane's axis-aligned bounding box"""
+        if not self.points:
+            return
+        xs = [p.pos.x for p in self.points]
+        ys = [p.pos.y for p in self.points]
+        self.aabb = (min(xs), min(ys), max(xs), max(ys))
+
     def draw(self, surface, camera):
         from main import selected_entities
         # Use the cell's body_color; slightly lighten when selected
@@ -707,7 +1024,10 @@ class SoftBody(Entity):
             base_color = tuple(min(255, int(c * 1.15)) for c in base_rgb)
         else:
             base_color = base_rgb
-        vertices = [camera.world_to_screen(p.pos) for p in self.points]
+        if hasattr(camera, 'world_to_screen_array'):
+            vertices = camera.world_to_screen_array(self.point_array()).tolist()
+        else:
+            vertices = [camera.world_to_screen(p.pos) for p in self.points]
         
         if len(vertices) >= 3:  # need at least a triangle
             # Draw the main polygon
@@ -838,7 +1158,7 @@ class SoftBody(Entity):
                 # This ensures both cells have full membrane capacity for new protein equipping
                 clone.is_protein = False
                 clone.upgrade = None
-                clone.image = clone.get_image()
+                clone.image = None  # Back to the shared membrane image
                 clones.append(clone)
             return clones
 
@@ -901,7 +1221,7 @@ class SoftBody(Entity):
                         # Reset the point to normal membrane point
                         p.is_protein = False
                         p.upgrade = None
-                        p.image = p.get_image()
+                        p.image = None  # Back to the shared membrane image
                         if hasattr(p, 'name'):
                             delattr(p, 'name')
                         if hasattr(p, 'desc'):
@@ -997,6 +1317,7 @@ class SoftBody(Entity):
         min_dist = float('inf')
         closest_point = None
         closest_edge_normal = None
+        center = sum([p.pos for p in polygon_points], pygame.Vector2(0, 0)) / len(polygon_points)
         
         # Check each edge of the polygon
         for i in range(len(polygon_points)):
@@ -1026,7 +1347,6 @@ class SoftBody(Entity):
                 # Normal pointing outward from edge
                 edge_normal = pygame.Vector2(-edge.y, edge.x).normalize()
                 # Make sure normal points away from polygon center
-                center = sum([p.pos for p in polygon_points], pygame.Vector2(0, 0)) / len(polygon_points)
                 if (closest_point - center).dot(edge_normal) < 0:
                     edge_normal = -edge_normal
                 closest_edge_normal = edge_normal
@@ -1042,33 +1362,52 @@ class SoftBody(Entity):
         """
         New collision system using ray casting (point-in-polygon test).
         More stable with Verlet integration than force-based approach.
+        Candidate cell pairs come from the shared sweep-and-prune broadphase,
+        so only cells with overlapping bounding boxes are tested.
+        Only reached through the legacy resolve_*_collisions API; the game loop
+        resolves collisions in PhysicsWorld.step with CollisionSystem.
         """
-        # Check each cell against every other cell
-        for i in range(len(cells)):
-            for j in range(len(cells)):
-                if i == j:
-                    continue
-                    
-                cell_a, cell_b = cells[i], cells[j]
-                
-                # Quick distance check first
-                center_dist = cell_a.center.distance_to(cell_b.center)
-                if center_dist > (cell_a.radius + cell_b.radius + padding * 2):
-                    continue
-                
-                # Check if any points of cell_a are inside cell_b
-                for point in cell_a.points:
-                    if SoftBody.point_in_polygon(point.pos, cell_b.points):
-                        # Point is inside the other cell, move it outside
-                        new_pos = SoftBody.get_closest_edge_point(point.pos, cell_b.points, padding)
-                        
-                        # Update both current position and old position to maintain velocity
-                        velocity = point.pos - point.old_pos
-                        point.pos = new_pos
-                        point.old_pos = new_pos - velocity * 0.8  # Slight damping
-                        
-                        # Mark point for debug visualization
-                        point.collision_detected = True
+        for first, second in physics.broadphase.pairs(cells, margin=padding):
+            # Quick distance check first
+            center_dist = first.center.distance_to(second.center)
+            if center_dist > (first.radius + second.radius + padding * 2):
+                continue
+
+            for cell_a, cell_b in ((first, second), (second, first)):
+                # Check all points of cell_a against cell_b in one go
+                inside, projections, normals = SoftBody.polygon_penetration(cell_a, cell_b)
+                for i in np.flatnonzero(inside).tolist():
+                    if np.isnan(projections[i, 0]):
+                        continue
+                    # Point is inside the other cell, move it outside
+                    point = cell_a.points[i]
+                    new_pos = pygame.Vector2(*(projections[i] + normals[i] * padding))
+
+                    # Update both current position and old position to maintain velocity
+                    velocity = point.pos - point.old_pos
+                    point.pos = new_pos
+                    point.old_pos = new_pos - velocity * 0.8  # Slight damping
+
+                    # Mark point for debug visualization
+                    point.collision_detected = True
+
+    @staticmethod
+    def polygon_penetration(cell_a, cell_b):
+        """
+        Batch narrowphase: test every point of cell_a against cell_b's membrane.
+        Returns (inside, projections, normals) arrays: a penetration flag per
+        point and, for penetrating points, the closest point on cell_b's outline
+        and that edge's outward normal (other rows are zero).
+        Used by resolve_polygon_collisions (legacy API, not the game loop).
+        """
+        points = cell_a.point_array()
+        polygon = cell_b.point_array()
+        inside = physics.points_in_polygon(points, polygon)
+        projections = np.zeros_like(points)
+        normals = np.zeros_like(points)
+        if inside.any():
+            projections[inside], normals[inside] = physics.closest_edge_points(points[inside], polygon)
+        return inside, projections, normals
     
     @staticmethod
     def resolve_point_collisions(cells, min_dist=15.0, stiffness=0.8, damping=0.95):
@@ -1274,7 +1613,7 @@ class Cell(SoftBody):
                 new_point.is_visual = False
                 new_point.is_protein = False
                 new_point.upgrade = None
-                new_point.image = new_point.get_image()
+                new_point.image = None  # Back to the shared membrane image
                 # Safely remove protein-specific attributes if they exist
                 for attr in ['name', 'desc']:
                     if hasattr(new_point, attr):
@@ -1369,6 +1708,7 @@ class Cell(SoftBody):
 
     def take_damage(self, damage, current_time, attacker=None):
         """Deal damage to the cell and update last damage time and targeting"""
+        self.wake()
         original_damage = damage
         
         # Check Resonance Shield first (single-use)
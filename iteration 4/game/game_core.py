@@ -0,0 +1,132 @@
+"""
+Headless driver for the game simulation.
+
+main.py holds the game state as module globals (entities reach it with
+`from main import ...`). GameCore imports it without opening a real window,
+starts a game and advances it with step(dt, inputs), skipping all drawing.
+It is meant for benchmarks, soak tests and parameter sweeps.
+
+The game state still lives in main.py's module globals, so there is one game
+per process: creating a GameCore re-initializes it, and an older core can no
+longer step (it raises instead of silently sharing the newer core's world).
+Run concurrent sweeps in separate processes.
+
+Command line, fast-forwarding N seconds as fast as the CPU allows:
+
+    python game_core.py --seconds 60 --mode lab --seed 1
+
+Set CELLLAB_SAMPLE=speedscope (or collapsed) to record stack samples of the run.
+"""
+
+import argparse
+import os
+import random
+import time
+
+
+class GameCore:
+    """Drives the process's game session and steps it frame by frame (drawing only if render=True)"""
+
+    current = None  # Newest GameCore; the only one whose state main.py still holds
+
+    def __init__(self, mode="singleplayer", seed=None, headless=True, render=False):
+        if headless:
+            # Must be set before pygame's display is initialised (on importing main)
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        if seed is not None:
+            random.seed(seed)
+
+        import main as game
+        from game_state import GameState
+
+        self.game = game
+        game.headless = headless
+        self.render = render or not headless  # Draw into the (dummy) screen each frame
+        self.mode = mode
+        self.sim_time = 0.0
+        self.frames = 0
+
+        game.initialize_new_game(mode)
+        game.game_state_manager.set_state(GameState.LAB_MODE if mode == "lab" else GameState.SINGLEPLAYER)
+        GameCore.current = self
+
+    # ---- state access ----
+    @property
+    def player_cells(self):
+        return self.game.player_cells
+
+    @property
+    def enemy_cells(self):
+        return self.game.enemy_cells
+
+    @property
+    def viruses(self):
+        return self.game.viruses
+
+    @property
+    def world_map(self):
+        return self.game.world_map
+
+    @property
+    def physics_world(self):
+        return self.game.physics_world
+
+    # ---- simulation ----
+    def step(self, dt, inputs=None):
+        """Advance one frame of dt seconds; inputs is an optional list of pygame events"""
+        if GameCore.current is not self:
+            raise RuntimeError("A newer GameCore has re-initialized the shared game state; "
+                               "use one process per concurrent game")
+        with self.game.profiler.frame():
+            running = self.game.step(dt, list(inputs or []), render=self.render)
+        self.sim_time += dt
+        self.frames += 1
+        return running
+
+    def run(self, seconds, dt=None):
+        """Fast-forward the given number of simulated seconds; returns wall-clock seconds taken"""
+        from config import FPS
+        dt = dt if dt is not None else 1.0 / FPS
+        frames = int(round(seconds / dt))
+        start = time.perf_counter()
+        for _ in range(frames):
+            if not self.step(dt):
+                break
+        return time.perf_counter() - start
+
+    def summary(self):
+        """Entity counts for logging"""
+        chunks = len(self.world_map.world_generator.chunks) if self.world_map else 0
+        return {
+            "sim_time": round(self.sim_time, 3),
+            "frames": self.frames,
+            "player_cells": len(self.player_cells),
+            "enemy_cells": len(self.enemy_cells),
+            "viruses": len(self.viruses),
+            "chunks": chunks,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the cell simulation headless")
+    parser.add_argument("--seconds", type=float, default=60.0, help="simulated seconds to fast-forward")
+    parser.add_argument("--dt", type=float, default=None, help="frame time in seconds (default 1/FPS)")
+    parser.add_argument("--mode", choices=("singleplayer", "lab"), default="singleplayer")
+    parser.add_argument("--seed", type=int, default=None, help="seed for Python's random module")
+    args = parser.parse_args(argv)
+
+    core = GameCore(mode=args.mode, seed=args.seed)
+    from profiler import sampler
+    sampler.start_from_env()  # CELLLAB_SAMPLE=speedscope|collapsed
+    wall = core.run(args.seconds, args.dt)
+    if sampler.running:
+        print(f"Stack samples written to {sampler.stop()}")
+    info = core.summary()
+    speed = info["sim_time"] / wall if wall > 0 else float("inf")
+    print(f"Simulated {info['sim_time']:.1f}s ({info['frames']} frames) in {wall:.2f}s wall, {speed:.1f}x real time")
+    print(", ".join(f"{k}={v}" for k, v in info.items() if k not in ("sim_time", "frames")))
+
+
+if __name__ == "__main__":
+    main()
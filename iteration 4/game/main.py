@@ -1,17 +1,27 @@
-from turtle import mode
+import sys
 import pygame
 import random
 import math
 import time
 from config import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, SILVER, LIGHT_BLUE, DARK_BLUE, BROWN, GRAY
+from config import BACKGROUND_ZOOM_STEP, BACKGROUND_PREWARM_ZOOMS
+
+if __name__ == "__main__":
+    # Entities do `from main import ...`; when this file is run as a script,
+    # register it under that name so they share this module's state instead
+    # of importing (and running) a second copy
+    sys.modules.setdefault("main", sys.modules[__name__])
 
 from player import PlayerCell
-from virus import CapsidVirus, FilamentousVirus, PhageVirus 
+from virus import Virus, CapsidVirus, FilamentousVirus, PhageVirus 
 from ui import GameUI, UpgradeUI, Button, SettingsMenuUI, MainMenuUI, ImageButton
 from ui import MapUI
-from molecule import Protein, Lipid, NucleicAcid, Carbohydrate
+from molecule import Protein, Lipid, NucleicAcid, Carbohydrate, MOLECULE_KINDS, MOLECULE_RADIUS
 from camera import Camera
-from entity import Cell, ExternalSpring
+from sprites import quantize_zoom, scaled_sprite
+from entity import Cell, EnemyCell, ExternalSpring
+from physics import PhysicsWorld
+from profiler import profiler, sampler
 from upgrade import OrganelleUpgrade, buy_organelle, buy_protein
 from game_state import GameStateManager, GameState
 from discovery_tracker import DiscoveryTracker
@@ -138,6 +148,10 @@ clock = pygame.time.Clock()
 delta_time = 1.0/FPS  # Initialize as seconds
 
 current_menu = None
+headless = False  # Set by game_core.GameCore; substitutes render-only assets
+events = []  # Events of the frame being processed (read by update_game_systems)
+mouse_pos = (0, 0)
+selected_mode = None
 
 """"FUNCTIONS"""
 def open_menu(menu_name):
@@ -195,6 +209,8 @@ def initialize_new_game(mode: str):
     origin = PlayerCell((500, 500), defaults["starting_size"], defaults["starting_health"])
     player_cells = [origin]
     selected_entities = []
+    physics_world.clear()
+    physics_world.add_bodies(player_cells)
     
     # Reset world and camera
     camera = Camera(origin.pos, zoom=1.0)
@@ -210,7 +226,6 @@ def initialize_new_game(mode: str):
     sprites.clear()
     viruses.clear()
     enemy_cells.clear()
-    external_springs.clear()
     
     # Initialize UI components for the game
     initialize_game_ui()
@@ -238,6 +253,7 @@ def load_saved_game(mode: str):
         current_game_mode = mode
         
         # Reconstruct player cells from serialized data
+        physics_world.remove_bodies(player_cells)
         player_cells = []
         from player import PlayerCell
         from molecule import Lipid
@@ -254,6 +270,7 @@ def load_saved_game(mode: str):
             cell.max_health = max_health
             player_cells.append(cell)
             sprites.append(cell)
+        physics_world.add_bodies(player_cells)
         
         player_molecules = instance.player_molecules
         player_upgrades = instance.player_upgrades
@@ -293,7 +310,7 @@ def start_game_mode(mode: str):
     elif mode == "lab":
         game_state_manager.set_state(GameState.LAB_MODE)
 
-def handle_game_logic(events, delta_time):
+def handle_game_logic(events, delta_time, render=True):
     """Handle all game logic when in a game state - restored from iteration 3"""
     global current_menu, player_cells, enemy_cells, viruses, external_springs, camera_follow_group_key
     global selected_entities, is_selecting, selection_box, cell_groups, mouse_pos
@@ -648,10 +665,13 @@ def handle_game_logic(events, delta_time):
     
     # Update game systems only if we have initialized components
     if player_cells and camera and world_map:
-        update_game_systems(delta_time)
+        with profiler.scope("update"):
+            update_game_systems(delta_time)
         
-    # Render the game
-    render_game(delta_time)
+    # Render the game at positions interpolated between physics steps
+    if render:
+        with profiler.scope("render"), physics_world.interpolated():
+            render_game(delta_time)
 
 # Maintain ordering of group navigation (restored from iteration 3)
 def _group_keys_sorted():
@@ -665,12 +685,29 @@ def _group_keys_sorted():
         return (1, k)
     return sorted(cell_groups.keys(), key=key_fn)
 
+def collect_molecules(cell, store):
+    """Move the molecules of a chunk's MoleculeStore that touch cell into the central inventory"""
+    collected = store.take_within(cell.center.x, cell.center.y, cell.radius + MOLECULE_RADIUS)
+    if not len(collected):
+        return
+    for kind, mol_type_name in enumerate(MOLECULE_KINDS):
+        picked = collected["value"][collected["kind"] == kind]
+        if len(picked):
+            # Add to central inventory
+            player_molecules[mol_type_name] += int(picked.sum())
+            # Trigger discovery for molecule collection
+            if discovery_tracker:
+                discovery_tracker.on_molecule_collected(mol_type_name, len(picked))
+
 def process_poi_spawns():
     """Process pending POI spawns from discovered chunks"""
     if not world_map or not hasattr(world_map, 'world_generator'):
         return
-        
-    for chunk in world_map.world_generator.chunks.values():
+    
+    # Only chunks whose POI spawned since the last call (queued by Chunk.spawn_poi_entities)
+    spawn_queue = world_map.world_generator.poi_spawn_queue
+    queued, spawn_queue[:] = spawn_queue[:], []
+    for chunk in queued:
         # Process virus cluster spawns
         if hasattr(chunk, 'pending_virus_spawns') and chunk.pending_virus_spawns:
             # Trigger POI discovery (only once per chunk)
@@ -717,6 +754,7 @@ def process_poi_spawns():
             giant_enemy = EnemyCell(pos, points=points, radius=radius, membrane_molecule=Lipid)
             enemy_cells.append(giant_enemy)
             sprites.append(giant_enemy)
+            physics_world.add_bodies([giant_enemy])
             
             # Clear the pending spawn
             chunk.pending_enemy_spawn = None
@@ -779,6 +817,8 @@ def update_game_systems(delta_time):
             sb1.target_pos = sb1.pos
             sb2.target_pos = sb2.pos
             player_cells.remove(old_body)
+            physics_world.remove_bodies([old_body])
+            physics_world.add_bodies([sb1, sb2])
             sb1.radius = max(10, sb1.radius * 0.75) 
             sb2.radius = max(10, sb2.radius * 0.75)
             
@@ -793,23 +833,27 @@ def update_game_systems(delta_time):
             break
 
     # Update viruses
-    for virus in viruses:
-        all_cells = player_cells + enemy_cells
-        if hasattr(virus, 'update'):
-            virus.update(all_cells, delta_time)
+    with profiler.scope("viruses"):
+        for virus in viruses:
+            all_cells = player_cells + enemy_cells
+            if hasattr(virus, 'update'):
+                virus.update(all_cells, delta_time)
             
-        # Check for virus-cell collisions
-        for cell in all_cells:
-            distance = virus.pos.distance_to(cell.center)
-            if distance < (virus.radius + cell.radius):
-                # Virus attacks cell
-                if hasattr(cell, 'take_damage'):
-                    cell.take_damage(10, current_time, virus)
-
-    # Update enemy cells
-    for cell in enemy_cells:
-        if hasattr(cell, 'update'):
-            cell.update(screen, [], delta_time, camera)
+            # Check for virus-cell collisions
+            for cell in all_cells:
+                distance = virus.pos.distance_to(cell.center)
+                if distance < (virus.radius + cell.radius):
+                    # Virus attacks cell
+                    if hasattr(cell, 'take_damage'):
+                        cell.take_damage(10, current_time, virus)
+
+    # Update enemy cells (far-away ones at a reduced rate, see PhysicsWorld.lod_delta)
+    with profiler.scope("enemies"):
+        for cell in enemy_cells:
+            if hasattr(cell, 'update'):
+                cell_delta = physics_world.lod_delta(cell, delta_time)
+                if cell_delta > 0:
+                    cell.update(screen, [], cell_delta, camera)
     
     # Handle cell deaths and cleanup
     dying_player_cells = [cell for cell in player_cells if hasattr(cell, 'health') and cell.health <= 0]
@@ -824,55 +868,34 @@ def update_game_systems(delta_time):
             discovery_tracker.on_virus_defeated()
     
     # Remove dead cells
+    physics_world.remove_bodies(dying_player_cells + dying_enemy_cells)
     player_cells[:] = [cell for cell in player_cells if not hasattr(cell, 'health') or cell.health > 0]
     enemy_cells[:] = [cell for cell in enemy_cells if not hasattr(cell, 'health') or cell.health > 0]
     
     # Remove dead viruses
     viruses[:] = [virus for virus in viruses if not hasattr(virus, 'health') or virus.health > 0]
     
-    # Update external springs (inter-cell connections)
-    for spring in external_springs[:]:
-        if hasattr(spring, 'update'):
-            spring.update(delta_time)
-            if hasattr(spring, 'active') and not spring.active:
-                external_springs.remove(spring)
+    # Step all cell physics in one batch: membranes, external springs
+    # (inter-cell connections) and cell-cell collisions, on a fixed timestep.
+    # Cells far from the player cells and camera drop to a lower rate.
+    physics_world.set_focus([cell.center for cell in player_cells] + [camera.pos])
+    with profiler.scope("physics"):
+        physics_world.advance(delta_time)
     
     # Update connection chains and apply snake-like movement
     connection_manager.update_chains(external_springs, player_cells + enemy_cells)
     connection_manager.apply_snake_movement(delta_time)
     
-    # Handle molecule collection by player cells (RESTORED from iteration 3)
-    if world_map and hasattr(world_map, 'world_generator'):
-        for cell in player_cells:
-            for chunk in world_map.world_generator.chunks.values():
-                from world_generation import ChunkState
-                if chunk.state != ChunkState.UNDISCOVERED:
-                    molecules_to_remove = []
-                    for mol in chunk.molecules:
-                        # Check collision between cell and molecule
-                        distance = cell.center.distance_to(mol.pos)
-                        if distance < cell.radius + getattr(mol, 'radius', 15):  # Molecule collection radius
-                            # Add to central inventory
-                            mol_type_name = type(mol).__name__.lower()
-                            # Handle nucleicacid -> nucleic_acid mapping
-                            if mol_type_name == "nucleicacid":
-                                mol_type_name = "nucleic_acid"
-                            if mol_type_name in player_molecules:
-                                mol_value = getattr(mol, 'value', 1)  # Use molecule's value, default to 1
-                                player_molecules[mol_type_name] += mol_value
-                                molecules_to_remove.append(mol)
-                                # Trigger discovery for molecule collection
-                                if discovery_tracker:
-                                    discovery_tracker.on_molecule_collected(mol_type_name)
-                    
-                    # Remove collected molecules from chunk
-                    for mol in molecules_to_remove:
-                        chunk.molecules.remove(mol)
-    
-    # Handle collisions between cells
-    all_cells = player_cells + enemy_cells
-    if len(all_cells) > 1:
-        collision_system.detect_and_resolve_collisions(all_cells)
+    # Handle molecule collection by player cells (RESTORED from iteration 3);
+    # only the chunks overlapping each cell's collection radius are looked at
+    with profiler.scope("molecules"):
+        if world_map and hasattr(world_map, 'world_generator'):
+            from world_generation import ChunkState
+            for cell in player_cells:
+                reach = cell.radius + MOLECULE_RADIUS  # Molecule collection radius
+                for chunk in world_map.world_generator.get_existing_chunks_near(cell.center, reach):
+                    if chunk.state != ChunkState.UNDISCOVERED and chunk.molecules:
+                        collect_molecules(cell, chunk.molecules)
     
     # Update camera to follow selected entities or all player cells
     focus_cells = selected_entities if selected_entities else player_cells
@@ -914,10 +937,11 @@ def update_game_systems(delta_time):
     # Update world generation and chunk discovery
     if world_map and hasattr(world_map, 'update'):
         all_entities = player_cells + enemy_cells + viruses
-        world_map.update(player_cells, all_entities)
-        
-        # Process POI spawns from discovered chunks
-        process_poi_spawns()
+        with profiler.scope("world"):
+            world_map.update(player_cells, all_entities)
+            
+            # Process POI spawns from discovered chunks
+            process_poi_spawns()
     
     # Update discovery tracking
     if discovery_tracker:
@@ -951,18 +975,17 @@ def render_game(delta_time):
         # Not ready to render yet
         screen.fill((20, 25, 35))  # Dark background
         return
+    camera.begin_frame(screen)  # Cache screen center and viewport for this frame's conversions
     
     # Draw scrolling background
     camera_offset = camera.pos - pygame.Vector2(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-    draw_scrolling_background(screen, background_tile, camera_offset, camera)
+    with profiler.scope("background"):
+        draw_scrolling_background(screen, background_tile, camera_offset, camera)
     
-    # Render world boundaries and chunk backgrounds
-    if world_map and hasattr(world_map, 'render_world_boundaries'):
-        world_map.render_world_boundaries(screen, camera)
-        if hasattr(world_map, 'render_chunk_backgrounds'):
-            world_map.render_chunk_backgrounds(screen, camera)
-        if hasattr(world_map, 'render_biome_overlay'):
-            world_map.render_biome_overlay(screen, camera)
+    # Render world boundaries, chunk backgrounds and biome tint (one cached layer)
+    with profiler.scope("world"):
+        if world_map and hasattr(world_map, 'render_world_overlay'):
+            world_map.render_world_overlay(screen, camera)
     
     # Handle menu rendering
     if current_menu == "upgrade" and upgrade_ui:
@@ -988,47 +1011,44 @@ def render_game(delta_time):
             pygame.draw.circle(screen, (150, 100, 255), 
                              camera.world_to_screen(entity.target_pos), 8, 2)
     
-    # Draw player cells
-    for cell in player_cells:
-        if 'visuals' in globals() and hasattr(visuals, 'draw_cell_with_effects'):
-            visuals.draw_cell_with_effects(screen, cell, camera, delta_time, enable_effects=True)
-        else:
-            # Fallback drawing
-            screen_pos = camera.world_to_screen(cell.center)
-            pygame.draw.circle(screen, (100, 150, 255), screen_pos, int(cell.radius * camera.zoom))
+    with profiler.scope("cells"):
+        # Draw player cells
+        for cell in player_cells:
+            if 'visuals' in globals() and hasattr(visuals, 'draw_cell_with_effects'):
+                visuals.draw_cell_with_effects(screen, cell, camera, delta_time, enable_effects=True)
+            else:
+                # Fallback drawing
+                screen_pos = camera.world_to_screen(cell.center)
+                pygame.draw.circle(screen, (100, 150, 255), screen_pos, int(cell.radius * camera.zoom))
             
-        # Draw protein abilities if available
-        if hasattr(cell, 'draw_protein_abilities'):
-            cell.draw_protein_abilities(screen, camera)
-    
-    # Draw enemy cells
-    for cell in enemy_cells:
-        if 'visuals' in globals() and hasattr(visuals, 'draw_cell_with_effects'):
-            visuals.draw_cell_with_effects(screen, cell, camera, delta_time, enable_effects=True)
-        else:
-            # Fallback drawing
-            screen_pos = camera.world_to_screen(cell.center)
-            pygame.draw.circle(screen, (255, 100, 100), screen_pos, int(cell.radius * camera.zoom))
-    
-    # Draw viruses
-    for virus in viruses:
-        if hasattr(virus, 'draw'):
-            virus.draw(screen, camera)
-        else:
-            # Fallback drawing
-            screen_pos = camera.world_to_screen(virus.pos)
-            pygame.draw.circle(screen, (255, 255, 100), screen_pos, int(virus.radius * camera.zoom))
-    
-    # Draw molecules if available
-    if world_map and hasattr(world_map, 'get_molecules_in_discovered_chunks'):
-        molecules = world_map.get_molecules_in_discovered_chunks()
-        for mol in molecules:
-            if 'visuals' in globals() and hasattr(visuals, 'draw_molecule_with_effects'):
-                visuals.draw_molecule_with_effects(screen, mol, camera, delta_time, enable_effects=True)
+            # Draw protein abilities if available
+            if hasattr(cell, 'draw_protein_abilities'):
+                cell.draw_protein_abilities(screen, camera)
+    
+        # Draw enemy cells
+        for cell in enemy_cells:
+            if 'visuals' in globals() and hasattr(visuals, 'draw_cell_with_effects'):
+                visuals.draw_cell_with_effects(screen, cell, camera, delta_time, enable_effects=True)
             else:
                 # Fallback drawing
-                screen_pos = camera.world_to_screen(mol.pos)
-                pygame.draw.circle(screen, (100, 255, 100), screen_pos, 5)
+                screen_pos = camera.world_to_screen(cell.center)
+                pygame.draw.circle(screen, (255, 100, 100), screen_pos, int(cell.radius * camera.zoom))
+    
+    with profiler.scope("viruses"):
+        # Draw viruses
+        for virus in viruses:
+            if hasattr(virus, 'draw'):
+                virus.draw(screen, camera)
+            else:
+                # Fallback drawing
+                screen_pos = camera.world_to_screen(virus.pos)
+                pygame.draw.circle(screen, (255, 255, 100), screen_pos, int(virus.radius * camera.zoom))
+    
+    with profiler.scope("molecules"):
+        # Draw molecules straight from the record arrays of the chunks in view
+        if world_map and hasattr(world_map, 'get_visible_molecule_records'):
+            molecules = world_map.get_visible_molecule_records(camera, screen.get_size())
+            visuals.draw_molecule_records(screen, molecules, camera, delta_time)
     
     # Draw external spring connections
     for spring in external_springs:
@@ -1039,51 +1059,63 @@ def render_game(delta_time):
     if 'visuals' in globals() and hasattr(visuals, 'draw_visual_systems'):
         visuals.draw_visual_systems(screen, camera)
     
-    # Draw UI components
-    if game_ui:
-        game_ui.draw(delta_time)
+    with profiler.scope("ui"):
+        # Draw UI components
+        if game_ui:
+            game_ui.draw(delta_time)
     
-    if cell_manager_ui:
-        try:
-            cell_manager_ui.draw(screen)
-        except:
-            pass  # Handle any UI drawing errors gracefully
-    
-    # Draw header buttons only when not in menus
-    if current_menu != "upgrade" and upgrade_button and settings_button and map_button and notebook_button:
-        upgrade_button.draw(screen)
-        settings_button.draw(screen)
-        map_button.draw(screen)
-        notebook_button.draw(screen)
-    
-    # Draw evolution meter
-    if evolution_meter:
-        evolution_meter.draw(screen)
-    
-    # Draw notebook UI if open
-    if notebook_ui and notebook_ui.is_open:
-        notebook_ui.draw()
-    
-    # Draw map UI if open (always on top)
-    if map_ui and map_ui.is_open:
-        molecules = world_map.get_molecules_in_discovered_chunks() if world_map else []
-        all_entities = player_cells + enemy_cells + viruses + molecules
-        map_ui.draw(screen, player_cells, all_entities)
+        if cell_manager_ui:
+            try:
+                cell_manager_ui.draw(screen)
+            except:
+                pass  # Handle any UI drawing errors gracefully
+    
+        # Draw header buttons only when not in menus
+        if current_menu != "upgrade" and upgrade_button and settings_button and map_button and notebook_button:
+            upgrade_button.draw(screen)
+            settings_button.draw(screen)
+            map_button.draw(screen)
+            notebook_button.draw(screen)
+    
+        # Draw evolution meter
+        if evolution_meter:
+            evolution_meter.draw(screen)
+    
+        # Draw notebook UI if open
+        if notebook_ui and notebook_ui.is_open:
+            notebook_ui.draw()
+    
+        # Draw map UI if open (always on top)
+        if map_ui and map_ui.is_open:
+            molecules = world_map.get_molecule_records(map_ui.get_visible_chunk_range()) if world_map else None
+            all_entities = player_cells + enemy_cells + viruses
+            map_ui.draw(screen, player_cells, all_entities, molecules)
+
+def get_scaled_background(texture, zoom):
+    """Background tile scaled for a zoom level, rounded to BACKGROUND_ZOOM_STEP and kept in the sprite cache"""
+    texture_size = int(texture.get_width() * quantize_zoom(zoom, BACKGROUND_ZOOM_STEP))
+    return scaled_sprite(texture, (texture_size, texture_size), smooth=True)
+
+def prewarm_background(texture, zooms=BACKGROUND_PREWARM_ZOOMS):
+    """Scale the background for the usual zoom levels ahead of the first frame"""
+    for zoom in zooms:
+        get_scaled_background(texture, zoom)
 
 def draw_scrolling_background(screen, texture, player_pos, camera):
     # Scale the texture according to camera zoom
-    texture_size = int(texture.get_width() * camera.zoom)
-    scaled_texture = pygame.transform.smoothscale(texture, (texture_size, texture_size))
+    scaled_texture = get_scaled_background(texture, camera.zoom)
+    texture_size = scaled_texture.get_width()
     screen_rect = screen.get_rect()
 
     # Calculate offset to scroll based on player position
     offset_x = -player_pos.x * camera.zoom % texture_size
     offset_y = -player_pos.y * camera.zoom % texture_size
 
-    # Draw enough tiles to fill the screen
-    for x in range(-texture_size, screen_rect.width + texture_size, texture_size):
-        for y in range(-texture_size, screen_rect.height + texture_size, texture_size):
-            screen.blit(scaled_texture, (x + offset_x, y + offset_y))
+    # Draw enough tiles to fill the screen, in one batched call
+    screen.blits([(scaled_texture, (x + offset_x, y + offset_y))
+                  for x in range(-texture_size, screen_rect.width + texture_size, texture_size)
+                  for y in range(-texture_size, screen_rect.height + texture_size, texture_size)],
+                 doreturn=False)
 
 def spawn_main_menu_softbody():
     """Spawn a new softbody for main menu simulation"""
@@ -1298,9 +1330,14 @@ def initialize_game_ui():
     global background_tile, game_ui, cell_manager_ui, upgrade_ui, settings_ui
     global upgrade_button, settings_button, map_button, notebook_button, notebook_ui, discovery_tracker, evolution_meter
     
-    # Load background
-    background_tile = pygame.image.load("assets\\scrolling_pattern.jpg").convert()
-    background_tile = pygame.transform.scale(background_tile, (SCREEN_WIDTH, SCREEN_HEIGHT))
+    # Load background (a plain tile when headless, where assets may be absent)
+    if headless:
+        background_tile = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        background_tile.fill(DARK_BLUE)
+    else:
+        background_tile = pygame.image.load("assets\\scrolling_pattern.jpg").convert()
+        background_tile = pygame.transform.scale(background_tile, (SCREEN_WIDTH, SCREEN_HEIGHT))
+    prewarm_background(background_tile)
     
     # Initialize UI components
     game_ui = GameUI(screen, player_cells[0] if player_cells else None)
@@ -1357,6 +1394,7 @@ def spawn_enemy_cell(pos):
     cell = EnemyCell(pos, points=12, radius=150, membrane_molecule=Lipid)
     enemy_cells.append(cell)
     sprites.append(cell)
+    physics_world.add_bodies([cell])
 
 game_ui = GameUI(screen, origin)
 from ui import CellManagerUI
@@ -1399,22 +1437,104 @@ is_selecting = False
 from entity import CollisionSystem
 collision_system = CollisionSystem(cell_size=50)
 
+# Physics world owning every simulated cell, external spring and collision pass
+physics_world = PhysicsWorld(collision_system, external_springs)
+
 # Initialize main menu simulation
 spawn_main_menu_softbody()
 
 #spawn_enemy_cell((100, 100))
 
-"""Main game loop"""
+def spawn_procedural_enemies(delta_time):
+    """Occasionally spawn rogue viruses/cells around player groups (restored from iteration 3)"""
+    if player_cells and world_map:
+        # Derive a view size based on current camera zoom (avoid division by zero)
+        effective_zoom = max(0, camera.zoom)
+        size_h = int(SCREEN_HEIGHT / effective_zoom)
+        size_w = int(SCREEN_WIDTH / effective_zoom)
+        half_size_h = size_h//2
+        half_size_w = size_w//2
+
+        bounding_box = pygame.Rect(camera.pos.x-half_size_w, camera.pos.y-half_size_h, size_w, size_h)
+        min_spawn_distance = 1000  # Minimum distance from any player cell
+
+        # Procedural enemy generation near groups (simplified from iteration 3)
+        def _random_point_near(center: pygame.Vector2, min_d: float, max_d: float) -> pygame.Vector2:
+            ang = random.uniform(0, 3.14159 * 2)
+            dist = random.uniform(min_d, max_d)
+            return pygame.Vector2(center.x + dist * math.cos(ang), center.y + dist * math.sin(ang))
+
+        def _get_chunk_for_pos(pos):
+            # None while the chunk is still being generated; such spots are not spawnable yet
+            return world_map.request_chunk_at_world_pos(pos)
+
+        def _chunk_has_enemy(chunk):
+            # Check if chunk contains any enemy cells or viruses (chunk entity index, as of the last world update)
+            return any(isinstance(entity, (EnemyCell, Virus)) for entity in chunk.entities)
+
+        def _spawn_enemy_at(pos: pygame.Vector2, enemy_kind: str):
+            chunk = _get_chunk_for_pos(pos)
+            if chunk is None:
+                return  # Chunk not generated yet
+            if _chunk_has_enemy(chunk):
+                return  # Mob cap reached, do not spawn
+            if enemy_kind == 'rogue-virus':
+                spawn_virus(pos)
+            elif enemy_kind == 'rogue-cell':
+                spawn_enemy_cell(pos)
+
+        # Choose a group center as focus for spawns
+        group_keys = [k for k, v in cell_groups.items() if v]
+        group_centers = []
+        for k in group_keys:
+            members = cell_groups[k]
+            if not members:
+                continue
+            c = pygame.Vector2(0, 0)
+            for m in members:
+                c += m.center
+            group_centers.append(c / len(members))
+
+        # Low probability each frame; scale with delta_time
+        if group_centers and random.random() < 0.02 * (delta_time * 60.0):
+            center = random.choice(group_centers)
+            spawn_type = random.choice(['rogue-virus', 'rogue-cell'])
+            # pick a valid spawn pos not too close to player cells
+            for _ in range(8):
+                pos = _random_point_near(center, 400, 900)
+                chunk = _get_chunk_for_pos(pos)
+                if chunk and not _chunk_has_enemy(chunk) and all(pos.distance_to(cell.center) > min_spawn_distance for cell in player_cells):
+                    _spawn_enemy_at(pos, spawn_type)
+                    break
+
+
+def step(delta_time, frame_events, render=True):
+    """Advance the game by one frame of delta_time seconds.
 
-running = True
-while running:
-    events = pygame.event.get()
+    frame_events are the pygame events for this frame. With render=False
+    nothing is drawn, so the simulation can run headless (see game_core.py).
+    Returns False once a QUIT event has been received.
+    """
+    global events, mouse_pos, selected_mode
+    events = frame_events
     mouse_pos = pygame.mouse.get_pos()
-    
+    keep_running = True
+
     # Handle basic events that should always work
     for event in events:
         if event.type == pygame.QUIT:
-            running = False
+            keep_running = False
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            # Frame-time profiler overlay
+            profiler.toggle_overlay()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+            # Export the profiler's frame history (Shift for CSV)
+            fmt = "csv" if event.mod & pygame.KMOD_SHIFT else "json"
+            print(f"Frame timings written to {profiler.export(fmt=fmt)}")
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+            # Start/stop the sampling profiler; stopping writes its stacks
+            path = sampler.toggle()
+            print(f"Stack samples written to {path}" if path else f"Sampling profiler {'started' if sampler.running else 'stopped'}")
     
     # Handle events based on current game state
     current_state = game_state_manager.get_state()
@@ -1427,78 +1547,38 @@ while running:
                 start_game_mode(selected_mode)
         
         # Draw main menu
-        main_menu_ui.draw(delta_time)
+        if render:
+            with profiler.scope("menu"):
+                main_menu_ui.draw(delta_time)
     
     else:
         # In game state - handle all game logic
-        # RESTORED: Add procedural enemy spawning from iteration 3
-        if player_cells and world_map:
-            # Derive a view size based on current camera zoom (avoid division by zero)
-            effective_zoom = max(0, camera.zoom)
-            size_h = int(SCREEN_HEIGHT / effective_zoom)
-            size_w = int(SCREEN_WIDTH / effective_zoom)
-            half_size_h = size_h//2
-            half_size_w = size_w//2
-
-            bounding_box = pygame.Rect(camera.pos.x-half_size_w, camera.pos.y-half_size_h, size_w, size_h)
-            min_spawn_distance = 1000  # Minimum distance from any player cell
-
-            # Procedural enemy generation near groups (simplified from iteration 3)
-            def _random_point_near(center: pygame.Vector2, min_d: float, max_d: float) -> pygame.Vector2:
-                ang = random.uniform(0, 3.14159 * 2)
-                dist = random.uniform(min_d, max_d)
-                return pygame.Vector2(center.x + dist * math.cos(ang), center.y + dist * math.sin(ang))
-
-            def _get_chunk_for_pos(pos):
-                return world_map.get_chunk_at_world_pos(pos)
-
-            def _chunk_has_enemy(chunk):
-                # Check if chunk contains any enemy cells or viruses
-                for cell in enemy_cells:
-                    if _get_chunk_for_pos(cell.center) == chunk:
-                        return True
-                for virus in viruses:
-                    if _get_chunk_for_pos(virus.pos) == chunk:
-                        return True
-                return False
-
-            def _spawn_enemy_at(pos: pygame.Vector2, enemy_kind: str):
-                chunk = _get_chunk_for_pos(pos)
-                if chunk and _chunk_has_enemy(chunk):
-                    return  # Mob cap reached, do not spawn
-                if enemy_kind == 'rogue-virus':
-                    spawn_virus(pos)
-                elif enemy_kind == 'rogue-cell':
-                    spawn_enemy_cell(pos)
-
-            # Choose a group center as focus for spawns
-            group_keys = [k for k, v in cell_groups.items() if v]
-            group_centers = []
-            for k in group_keys:
-                members = cell_groups[k]
-                if not members:
-                    continue
-                c = pygame.Vector2(0, 0)
-                for m in members:
-                    c += m.center
-                group_centers.append(c / len(members))
-
-            # Low probability each frame; scale with delta_time
-            if group_centers and random.random() < 0.02 * (delta_time * 60.0):
-                center = random.choice(group_centers)
-                spawn_type = random.choice(['rogue-virus', 'rogue-cell'])
-                # pick a valid spawn pos not too close to player cells
-                for _ in range(8):
-                    pos = _random_point_near(center, 400, 900)
-                    chunk = _get_chunk_for_pos(pos)
-                    if chunk and not _chunk_has_enemy(chunk) and all(pos.distance_to(cell.center) > min_spawn_distance for cell in player_cells):
-                        _spawn_enemy_at(pos, spawn_type)
-                        break
-        
-        handle_game_logic(events, delta_time)
+        with profiler.scope("spawning"):
+            spawn_procedural_enemies(delta_time)
+        handle_game_logic(events, delta_time, render)
+
+    if render and profiler.overlay_visible:
+        profiler.draw(screen)
+
+    return keep_running
+
+
+def run():
+    """Main game loop"""
+    global delta_time
+    running = True
+    sampler.start_from_env()
+    while running:
+        with profiler.frame():
+            running = step(delta_time, pygame.event.get())
+            with profiler.scope("present"):
+                pygame.display.flip()
+        delta_time = clock.tick(FPS) / 1000.0  # Convert milliseconds to seconds
+
+    if sampler.running:
+        print(f"Stack samples written to {sampler.stop()}")
+    pygame.quit()
 
-    pygame.display.flip()
-    delta_time = clock.tick(FPS) / 1000.0  # Convert milliseconds to seconds
 
-pygame.quit()
-                    
\ No newline at end of file
+if __name__ == "__main__":
+    run()
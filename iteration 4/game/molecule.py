@@ -1,18 +1,30 @@
+import numpy as np
 import pygame
 from entity import Point
+from sprites import shared_image
 import random
 
+
+def molecule_image(color, radius=15):
+    """Shared circle sprite for world molecules of one colour"""
+    def build():
+        surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(surf, color, (radius, radius), radius)
+        return surf
+    return shared_image(("molecule", color, radius), build)
+
 class Protein(Point):
     def __init__(self, pos, parent=None):
         super().__init__(pos, parent)
         self.radius = 15
-        self.image = pygame.Surface((30, 30), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (100, 180, 255), (15, 15), self.radius)
         self.pos = pygame.Vector2(pos)
         self.type = "protein"
         self.value = random.randint(1, 3)
         self.parent = parent
 
+    def get_image(self):
+        return molecule_image((100, 180, 255))
+
     def draw(self, surface, camera):
         screen_pos = camera.world_to_screen(self.pos)
         img = camera.apply_zoom(self.image)
@@ -22,25 +34,27 @@ class Lipid(Point):
     def __init__(self, pos, parent=None):
         super().__init__(pos, parent)
         self.radius = 15
-        self.image = pygame.Surface((30, 30), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (180, 255, 100), (15, 15), self.radius)
         self.pos = pygame.Vector2(pos)
         self.type = "lipid"
         self.value = random.randint(1, 3)
         self.parent = parent
 
+    def get_image(self):
+        return molecule_image((180, 255, 100))
+
 
 class NucleicAcid(Point):
     def __init__(self, pos, parent=None):
         super().__init__(pos, parent)
         self.radius = 15
-        self.image = pygame.Surface((30, 30), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (255, 100, 180), (15, 15), self.radius)
         self.pos = pygame.Vector2(pos)
         self.type = "nucleic_acid"
         self.value = random.randint(1, 3)
         self.parent = parent
 
+    def get_image(self):
+        return molecule_image((255, 100, 180))
+
     def draw(self, surface, camera):
         screen_pos = camera.world_to_screen(self.pos)
         img = camera.apply_zoom(self.image)
@@ -50,14 +64,127 @@ class Carbohydrate(Point):
     def __init__(self, pos, parent=None):
         super().__init__(pos, parent)
         self.radius = 15
-        self.image = pygame.Surface((30, 30), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (200, 200, 100), (15, 15), self.radius)
         self.pos = pygame.Vector2(pos)
         self.type = "carbohydrate"
         self.value = random.randint(1, 3)
         self.parent = parent
 
+    def get_image(self):
+        return molecule_image((200, 200, 100))
+
     def draw(self, surface, camera):
         screen_pos = camera.world_to_screen(self.pos)
         img = camera.apply_zoom(self.image)
-        surface.blit(img, img.get_rect(center=screen_pos))
\ No newline at end of file
+        surface.blit(img, img.get_rect(center=screen_pos))
+
+# ---- World molecule storage ----
+# Molecules lying in the world are kept per chunk as rows of a NumPy record
+# array instead of Point objects; an entity is only built (MoleculeStore.entity)
+# when something needs one.
+MOLECULE_KINDS = ("protein", "lipid", "nucleic_acid", "carbohydrate")  # kind id -> type name
+MOLECULE_CLASSES = (Protein, Lipid, NucleicAcid, Carbohydrate)  # kind id -> entity class
+MOLECULE_KIND_IDS = {name: i for i, name in enumerate(MOLECULE_KINDS)}
+MOLECULE_RADIUS = 15  # Pickup and drawing radius of world molecules
+MOLECULE_DTYPE = np.dtype([("x", "f4"), ("y", "f4"), ("kind", "i1"), ("value", "i2"), ("alive", "?")])
+
+
+class MoleculeStore:
+    """Compact molecule records (x, y, kind, value, alive) for one chunk.
+
+    Removal only clears the alive flag; dead rows are compacted away once
+    they make up half the array. Rows are kept sorted by x (re-sorted lazily
+    after additions) so take_within can binary-search its candidates.
+    """
+
+    def __init__(self, capacity=16):
+        self.records = np.zeros(capacity, dtype=MOLECULE_DTYPE)
+        self.size = 0  # Rows in use (alive or dead)
+        self.alive_count = 0
+        self._sorted = True  # Rows ordered by x
+        self.version = 0  # Bumped by every addition or removal
+
+    def __len__(self):
+        return self.alive_count
+
+    def add(self, x, y, kind, value):
+        """Append one molecule; kind is a type name or kind id"""
+        if self.size == len(self.records):
+            self.records = np.resize(self.records, max(16, len(self.records) * 2))
+        kind = MOLECULE_KIND_IDS[kind] if isinstance(kind, str) else kind
+        if self.size and x < self.records[self.size - 1]["x"]:
+            self._sorted = False
+        self.records[self.size] = (x, y, kind, value, True)
+        self.size += 1
+        self.alive_count += 1
+        self.version += 1
+
+    def append(self, molecule):
+        """Store a molecule entity (e.g. a dropped Protein) as a record"""
+        self.add(molecule.pos.x, molecule.pos.y, molecule.type, getattr(molecule, "value", 1))
+
+    def alive(self):
+        """Record view of the live molecules"""
+        rows = self.records[:self.size]
+        return rows if self.alive_count == self.size else rows[rows["alive"]]
+
+    def remove_mask(self, mask):
+        """Kill the live molecules selected by a boolean mask over alive(); returns the removed records"""
+        rows = self.records[:self.size]
+        live = np.flatnonzero(rows["alive"])[mask]
+        removed = rows[live].copy()
+        rows["alive"][live] = False
+        self.alive_count -= len(live)
+        self.version += 1
+        if self.alive_count * 2 < self.size:
+            self.compact()
+        return removed
+
+    def take_within(self, x, y, radius):
+        """Remove and return the live molecules closer than radius to (x, y)"""
+        if not self._sorted:
+            self.compact()
+        rows = self.records[:self.size]
+        xs = rows["x"]
+        lo, hi = np.searchsorted(xs, (x - radius, x + radius))
+        if lo == hi:
+            return rows[:0]
+        candidates = rows[lo:hi]
+        dx = candidates["x"] - x
+        dy = candidates["y"] - y
+        hit = np.flatnonzero(candidates["alive"] & (dx * dx + dy * dy < radius * radius)) + lo
+        if not len(hit):
+            return rows[:0]
+        removed = rows[hit].copy()
+        rows["alive"][hit] = False
+        self.alive_count -= len(hit)
+        self.version += 1
+        if self.alive_count * 2 < self.size:
+            self.compact()
+        return removed
+
+    def compact(self):
+        """Drop dead rows and restore the x ordering"""
+        kept = self.alive()
+        if not self._sorted:
+            kept = kept[np.argsort(kept["x"], kind="stable")]
+        self.records = np.zeros(max(16, len(kept)), dtype=MOLECULE_DTYPE)
+        self.records[:len(kept)] = kept
+        self.size = self.alive_count = len(kept)
+        self._sorted = True
+
+    def entity(self, record):
+        """Build a molecule entity for one record"""
+        molecule = MOLECULE_CLASSES[record["kind"]]((float(record["x"]), float(record["y"])))
+        molecule.value = int(record["value"])
+        return molecule
+
+    def __iter__(self):
+        """Entities for the live molecules, built on demand (slow; prefer alive())"""
+        for record in self.alive():
+            yield self.entity(record)
+
+
+def concat_records(stores):
+    """Live records of several MoleculeStores as one array"""
+    parts = [store.alive() for store in stores if store.alive_count]
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=MOLECULE_DTYPE)
@@ -0,0 +1,928 @@
+"""
+Array-backed soft-body physics for the cell simulation.
+
+The default SoftBody.update walks Point and Spring objects one at a time.
+This module keeps every membrane point's position, previous position, force,
+mass and rest offset in contiguous NumPy arrays (structure of arrays) and runs
+springs, Verlet integration and shape matching as vectorized kernels.
+
+Point and Spring objects stay the public API: once their body is attached to
+the engine their pos/old_pos/force/mass (and rest_length/spring_constant)
+attributes read and write straight through to the arrays.
+"""
+
+import math
+import weakref
+from contextlib import contextmanager
+
+import numpy as np
+import pygame
+
+from config import CELL_ROTATION_SPEED, SPRING_MAX_STRETCH_MULTIPLIER
+from config import PHYSICS_TIMESTEP, PHYSICS_SUBSTEPS, PHYSICS_MAX_STEPS_PER_FRAME, PHYSICS_INTERPOLATE
+from config import (
+    PHYSICS_LOD_RADIUS, PHYSICS_LOD_INTERVAL, PHYSICS_SLEEP_SPEED, PHYSICS_SLEEP_DELAY,
+    PHYSICS_WAKE_DISTANCE, PHYSICS_WAKE_MARGIN, PHYSICS_COLLISION_MARGIN
+)
+
+SHAPE_CORRECTION = 0.1  # Fraction of the shape-matching error removed per step
+
+
+class VectorField:
+    """Descriptor for a 2D attribute that lives in an array store when attached.
+
+    Detached objects keep a plain pygame.Vector2 in their __dict__, so objects
+    that never join the engine (world molecules, virus proteins) behave exactly
+    like before.
+    """
+
+    def __init__(self, column=None):
+        self.column = column
+
+    def __set_name__(self, owner, name):
+        if self.column is None:
+            self.column = name
+        self.private = "_" + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        store = obj._store
+        if store is None:
+            return obj.__dict__[self.private]
+        x, y = getattr(store, self.column)[obj._slot]
+        return pygame.Vector2(x, y)
+
+    def __set__(self, obj, value):
+        store = obj._store
+        if store is None:
+            obj.__dict__[self.private] = value
+        else:
+            getattr(store, self.column)[obj._slot] = (value[0], value[1])
+
+
+class ScalarField(VectorField):
+    """Descriptor for a scalar attribute that lives in an array store when attached."""
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        store = obj._store
+        if store is None:
+            return obj.__dict__[self.private]
+        return float(getattr(store, self.column)[obj._slot])
+
+    def __set__(self, obj, value):
+        store = obj._store
+        if store is None:
+            obj.__dict__[self.private] = value
+        else:
+            getattr(store, self.column)[obj._slot] = value
+
+
+class TrackedList(list):
+    """List that flags its owning body whenever its contents change.
+
+    SoftBody.points and SoftBody.springs use this so the engine only rebuilds a
+    body's index arrays after split/extend/equip style edits, not every frame.
+    """
+
+    __slots__ = ("owner",)
+
+    def __init__(self, owner, items=()):
+        super().__init__(items)
+        self.owner = owner
+
+    def _touch(self):
+        owner = self.owner
+        owner._physics_dirty = True
+        owner._topology_version += 1
+
+    def append(self, item):
+        super().append(item)
+        self._touch()
+
+    def extend(self, items):
+        super().extend(items)
+        self._touch()
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._touch()
+
+    def remove(self, item):
+        super().remove(item)
+        self._touch()
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self._touch()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._touch()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._touch()
+
+    def reverse(self):
+        super().reverse()
+        self._touch()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._touch()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._touch()
+
+    def __iadd__(self, items):
+        result = super().__iadd__(items)
+        self._touch()
+        return result
+
+
+class PointArrays:
+    """Structure-of-arrays storage for membrane points"""
+
+    def __init__(self, capacity=256):
+        self.pos = np.zeros((capacity, 2))
+        self.old_pos = np.zeros((capacity, 2))
+        self.force = np.zeros((capacity, 2))
+        self.rest = np.zeros((capacity, 2))  # Shape-matching offset from the body's centre of mass
+        self.mass = np.ones(capacity)
+        self.free_slots = list(range(capacity - 1, -1, -1))
+
+    @property
+    def capacity(self):
+        return len(self.mass)
+
+    def _grow(self):
+        old_capacity = self.capacity
+        new_capacity = old_capacity * 2
+        for name in ("pos", "old_pos", "force", "rest"):
+            grown = np.zeros((new_capacity, 2))
+            grown[:old_capacity] = getattr(self, name)
+            setattr(self, name, grown)
+        mass = np.ones(new_capacity)
+        mass[:old_capacity] = self.mass
+        self.mass = mass
+        self.free_slots.extend(range(new_capacity - 1, old_capacity - 1, -1))
+
+    def allocate(self):
+        if not self.free_slots:
+            self._grow()
+        return self.free_slots.pop()
+
+    def release(self, slot):
+        self.force[slot] = 0.0
+        self.free_slots.append(slot)
+
+
+class SpringArrays:
+    """Structure-of-arrays storage for intra-body springs"""
+
+    def __init__(self, capacity=256):
+        self.rest = np.zeros(capacity)
+        self.k = np.zeros(capacity)
+        self.free_slots = list(range(capacity - 1, -1, -1))
+
+    @property
+    def capacity(self):
+        return len(self.k)
+
+    def _grow(self):
+        old_capacity = self.capacity
+        new_capacity = old_capacity * 2
+        rest = np.zeros(new_capacity)
+        rest[:old_capacity] = self.rest
+        k = np.zeros(new_capacity)
+        k[:old_capacity] = self.k
+        self.rest, self.k = rest, k
+        self.free_slots.extend(range(new_capacity - 1, old_capacity - 1, -1))
+
+    def allocate(self):
+        if not self.free_slots:
+            self._grow()
+        return self.free_slots.pop()
+
+    def release(self, slot):
+        self.free_slots.append(slot)
+
+
+POINT_FIELDS = ("pos", "old_pos", "force", "mass")
+SPRING_FIELDS = (("rest_length", "rest"), ("spring_constant", "k"))
+
+
+class _Slots:
+    """Slot bookkeeping for one body, kept separate so it can outlive the body"""
+
+    def __init__(self):
+        self.points = []  # (slot, weakref to point) pairs
+        self.springs = []  # (slot, weakref to spring) pairs
+
+
+class BodyHandle:
+    """Per-body index arrays into the engine's shared storage"""
+
+    def __init__(self, engine, body):
+        self.engine = engine
+        self.slots = _Slots()
+        self.point_slots = np.zeros(0, dtype=np.intp)
+        self.spring_slots = np.zeros(0, dtype=np.intp)
+        self.spring_a = np.zeros(0, dtype=np.intp)  # Body-local index of each spring's first point
+        self.spring_b = np.zeros(0, dtype=np.intp)
+        self.finalizer = weakref.finalize(body, engine.release_slots, self.slots)
+
+    def step(self, body, delta_time):
+        self.engine.step([body], delta_time)
+
+
+class Batch:
+    """Concatenated index arrays for stepping several bodies in one kernel call"""
+
+    def __init__(self, bodies):
+        self.bodies = bodies
+        handles = [b._physics for b in bodies]
+        counts = np.array([len(h.point_slots) for h in handles], dtype=np.intp)
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.intp)
+        self.offsets = offsets  # Start of each body's run in point_slots
+        empty = np.zeros(0, dtype=np.intp)
+        self.point_slots = np.concatenate([h.point_slots for h in handles]) if handles else empty
+        self.body_index = np.repeat(np.arange(len(bodies)), counts)
+        self.spring_slots = np.concatenate([h.spring_slots for h in handles]) if handles else empty
+        self.spring_a = np.concatenate([h.spring_a + o for h, o in zip(handles, offsets)]) if handles else empty
+        self.spring_b = np.concatenate([h.spring_b + o for h, o in zip(handles, offsets)]) if handles else empty
+
+    def subset(self, body_mask):
+        """Batch over only the bodies where body_mask is True, without re-concatenating"""
+        body_mask = np.asarray(body_mask, dtype=bool)
+        sub = Batch([])
+        sub.bodies = [b for b, keep in zip(self.bodies, body_mask.tolist()) if keep]
+        point_mask = body_mask[self.body_index]
+        new_body = np.cumsum(body_mask) - 1
+        new_point = np.cumsum(point_mask) - 1
+        spring_mask = point_mask[self.spring_a]
+        sub.point_slots = self.point_slots[point_mask]
+        sub.body_index = new_body[self.body_index[point_mask]]
+        sub.spring_slots = self.spring_slots[spring_mask]
+        sub.spring_a = new_point[self.spring_a[spring_mask]]
+        sub.spring_b = new_point[self.spring_b[spring_mask]]
+        counts = np.bincount(sub.body_index, minlength=len(sub.bodies))
+        sub.offsets = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.intp)
+        return sub
+
+    def is_stale(self):
+        """True once any member body's points or springs have been edited"""
+        for body in self.bodies:
+            if body._physics_dirty or body._physics is None:
+                return True
+        return False
+
+
+class SoftBodyEngine:
+    """Vectorized spring / Verlet / shape-matching kernels over attached bodies"""
+
+    def __init__(self):
+        self.points = PointArrays()
+        self.springs = SpringArrays()
+
+    # ---- attachment ----
+    def attach(self, body):
+        """Attach a SoftBody; its points and springs become views on the arrays"""
+        handle = BodyHandle(self, body)
+        body._physics_dirty = True
+        return handle
+
+    def _attach_point(self, point):
+        values = [getattr(point, name) for name in POINT_FIELDS]
+        slot = self.points.allocate()
+        point._store = self.points
+        point._slot = slot
+        for name, value in zip(POINT_FIELDS, values):
+            setattr(point, name, value)
+
+    def _detach_point(self, point):
+        values = [getattr(point, name) for name in POINT_FIELDS]
+        self.points.release(point._slot)
+        point._store = None
+        point._slot = -1
+        for name, value in zip(POINT_FIELDS, values):
+            setattr(point, name, value)
+
+    def _attach_spring(self, spring):
+        values = [getattr(spring, name) for name, _ in SPRING_FIELDS]
+        slot = self.springs.allocate()
+        spring._store = self.springs
+        spring._slot = slot
+        for (name, _), value in zip(SPRING_FIELDS, values):
+            setattr(spring, name, value)
+
+    def _detach_spring(self, spring):
+        values = [getattr(spring, name) for name, _ in SPRING_FIELDS]
+        self.springs.release(spring._slot)
+        spring._store = None
+        spring._slot = -1
+        for (name, _), value in zip(SPRING_FIELDS, values):
+            setattr(spring, name, value)
+
+    def release_slots(self, slots):
+        """Give back every slot a body held (called when the body is discarded)"""
+        for slot, ref in slots.points:
+            point = ref()
+            if point is not None and point._store is self.points and point._slot == slot:
+                self._detach_point(point)
+            else:
+                self.points.release(slot)
+        for slot, ref in slots.springs:
+            spring = ref()
+            if spring is not None and spring._store is self.springs and spring._slot == slot:
+                self._detach_spring(spring)
+            else:
+                self.springs.release(slot)
+        slots.points = []
+        slots.springs = []
+
+    def detach(self, body):
+        """Return a body to the per-Point Python path"""
+        handle = body._physics
+        if handle is None:
+            return
+        handle.finalizer.detach()
+        self.release_slots(handle.slots)
+        body._physics = None
+
+    def rebuild(self, body):
+        """Re-sync a body's index arrays after its points or springs changed"""
+        handle = body._physics
+        points = list(body.points)
+        springs = list(body.springs)
+
+        current_points = {id(p) for p in points}
+        current_springs = {id(s) for s in springs}
+        for slot, ref in handle.slots.points:
+            point = ref()
+            if point is None or point._slot != slot:
+                self.points.release(slot)
+            elif id(point) not in current_points:
+                self._detach_point(point)
+        for slot, ref in handle.slots.springs:
+            spring = ref()
+            if spring is None or spring._slot != slot:
+                self.springs.release(slot)
+            elif id(spring) not in current_springs:
+                self._detach_spring(spring)
+
+        for point in points:
+            if point._store is None:
+                self._attach_point(point)
+        for spring in springs:
+            if spring._store is None:
+                self._attach_spring(spring)
+
+        handle.slots.points = [(p._slot, weakref.ref(p)) for p in points]
+        handle.slots.springs = [(s._slot, weakref.ref(s)) for s in springs]
+        handle.point_slots = np.fromiter((p._slot for p in points), dtype=np.intp, count=len(points))
+
+        # Shape-matching offsets; a stale initial_shape (e.g. right after
+        # extend_membrane) is recomputed rather than indexed out of range
+        shape = body.initial_shape
+        if len(shape) != len(points):
+            shape = body.calculate_shape()
+            body.initial_shape = shape
+        if points:
+            self.points.rest[handle.point_slots] = [(v.x, v.y) for v in shape]
+
+        local = {id(p): i for i, p in enumerate(points)}
+        linked = [s for s in springs if id(s.point1) in local and id(s.point2) in local]
+        handle.spring_slots = np.fromiter((s._slot for s in linked), dtype=np.intp, count=len(linked))
+        handle.spring_a = np.fromiter((local[id(s.point1)] for s in linked), dtype=np.intp, count=len(linked))
+        handle.spring_b = np.fromiter((local[id(s.point2)] for s in linked), dtype=np.intp, count=len(linked))
+
+        body._physics_dirty = False
+
+    # ---- simulation ----
+    def build_batch(self, bodies):
+        """Concatenate the index arrays of several attached bodies into one Batch"""
+        for body in bodies:
+            if body._physics_dirty:
+                self.rebuild(body)
+        return Batch([b for b in bodies if len(b._physics.point_slots)])
+
+    def step(self, bodies, delta_time):
+        """Advance the given attached bodies by delta_time seconds"""
+        self.step_batch(self.build_batch(bodies), delta_time)
+
+    def step_batch(self, batch, delta_time):
+        """Advance every body in a prebuilt Batch by delta_time seconds (scalar or one per body)"""
+        bodies = batch.bodies
+        if not bodies:
+            return
+
+        angles = np.array([b.angle for b in bodies], dtype=float)
+        ang_vels = np.array([b.ang_vel for b in bodies], dtype=float)
+        inertias = np.array([b.inertia for b in bodies], dtype=float)
+
+        com = self.integrate(batch.point_slots, batch.body_index, len(bodies),
+                             batch.spring_slots, batch.spring_a, batch.spring_b,
+                             angles, ang_vels, inertias, delta_time)
+
+        pos = self.points.pos[batch.point_slots]
+        lower = np.minimum.reduceat(pos, batch.offsets).tolist()
+        upper = np.maximum.reduceat(pos, batch.offsets).tolist()
+
+        for i, body in enumerate(bodies):
+            body.center = pygame.Vector2(com[i, 0], com[i, 1])
+            body.angle = float(angles[i])
+            body.ang_vel = float(ang_vels[i])
+            body.aabb = (lower[i][0], lower[i][1], upper[i][0], upper[i][1])
+
+    def integrate(self, point_slots, body_index, body_count,
+                  spring_slots, spring_a, spring_b,
+                  angles, ang_vels, inertias, delta_time):
+        """Core kernel; updates angles/ang_vels in place and returns each body's centre of mass"""
+        delta_time = np.broadcast_to(np.asarray(delta_time, dtype=float), (body_count,))
+        point_dt = delta_time[body_index]
+        store = self.points
+        pos = store.pos[point_slots]
+        old_pos = store.old_pos[point_slots]
+        force = store.force[point_slots]
+        mass = store.mass[point_slots]
+        n = len(point_slots)
+
+        # Centre of mass per body
+        total_mass = np.bincount(body_index, mass, body_count)
+        com = np.empty((body_count, 2))
+        com[:, 0] = np.bincount(body_index, pos[:, 0] * mass, body_count)
+        com[:, 1] = np.bincount(body_index, pos[:, 1] * mass, body_count)
+        safe_mass = np.where(total_mass > 0, total_mass, 1.0)
+        com /= safe_mass[:, None]
+        point_com = com[body_index]
+
+        # Angular motion from the net torque of the accumulated forces
+        r = pos - point_com
+        torque = np.bincount(body_index, r[:, 0] * force[:, 1] - r[:, 1] * force[:, 0], body_count)
+        alpha = np.divide(torque, inertias, out=np.zeros(body_count), where=inertias > 0)
+        ang_vels += alpha * delta_time
+        ang_vels += math.radians(CELL_ROTATION_SPEED) * delta_time
+        angles += ang_vels * delta_time
+
+        # Springs: clamp over-stretched springs, then Hooke forces
+        if len(spring_slots):
+            rest = self.springs.rest[spring_slots]
+            k = self.springs.k[spring_slots]
+            delta = pos[spring_b] - pos[spring_a]
+            distance = np.hypot(delta[:, 0], delta[:, 1])
+            live = distance > 0
+            direction = np.zeros_like(delta)
+            direction[live] = delta[live] / distance[live, None]
+
+            max_length = rest * SPRING_MAX_STRETCH_MULTIPLIER
+            over = live & (distance > max_length)
+            if over.any():
+                correction = direction * (np.where(over, distance - max_length, 0.0) * 0.5)[:, None]
+                pos += _scatter(spring_a, correction, n) - _scatter(spring_b, correction, n)
+                distance = np.where(over, max_length, distance)
+
+            spring_force = direction * (k * (distance - rest) * live)[:, None]
+            force += _scatter(spring_a, spring_force, n) - _scatter(spring_b, spring_force, n)
+
+        # Verlet integration
+        acceleration = force / mass[:, None]
+        new_pos = pos + (pos - old_pos) + acceleration * (point_dt ** 2)[:, None]
+        old_pos = pos
+        pos = new_pos
+
+        # Shape matching: pull each point toward its rotated rest offset
+        cos_a = np.cos(angles)[body_index]
+        sin_a = np.sin(angles)[body_index]
+        rest_offset = store.rest[point_slots]
+        target = np.empty_like(pos)
+        target[:, 0] = point_com[:, 0] + rest_offset[:, 0] * cos_a - rest_offset[:, 1] * sin_a
+        target[:, 1] = point_com[:, 1] + rest_offset[:, 0] * sin_a + rest_offset[:, 1] * cos_a
+        pos += (target - pos) * SHAPE_CORRECTION
+
+        store.pos[point_slots] = pos
+        store.old_pos[point_slots] = old_pos
+        store.force[point_slots] = 0.0
+        return com
+
+
+def _scatter(index, values, size):
+    """Sum rows of values into a (size, 2) array at the given row indices"""
+    out = np.empty((size, 2))
+    out[:, 0] = np.bincount(index, values[:, 0], size)
+    out[:, 1] = np.bincount(index, values[:, 1], size)
+    return out
+
+
+class PhysicsWorld:
+    """Owns the simulated cells, their external springs and the collision pass.
+
+    step() advances everything at once: NumPy-backed bodies go through a single
+    batched kernel call, python-backed bodies are stepped one by one, then
+    external springs and collisions are applied. The concatenated batch is
+    cached, so spawns, splits and deaths only re-index the bodies involved.
+
+    advance() runs step() on a fixed timestep from an accumulator so a slow
+    render frame never turns into one huge Verlet step; interpolated() blends
+    the last two physics states for drawing in between.
+
+    Level of detail: cells further than lod_radius from every focus point
+    (set_focus) only step every lod_interval steps, with a correspondingly
+    longer timestep. Cells that stay at rest for sleep_delay seconds fall
+    asleep and are skipped entirely until they are moved, damaged, linked by
+    an external spring or approached by an awake cell.
+
+    Collisions: a sweep-and-prune broadphase over the awake cells' bounding
+    boxes picks the cell pairs within collision_margin of each other; only
+    those pairs go through the collision system's point and spring tests.
+    """
+
+    def __init__(self, collision_system=None, external_springs=None, softbody_engine=None):
+        self.engine = softbody_engine if softbody_engine is not None else engine
+        self.collision_system = collision_system
+        self.bodies = []
+        self.external_springs = external_springs if external_springs is not None else []
+        self._batch = None
+        self._python_bodies = []
+        self.timestep = PHYSICS_TIMESTEP
+        self.substeps = PHYSICS_SUBSTEPS
+        self.max_steps_per_frame = PHYSICS_MAX_STEPS_PER_FRAME
+        self.interpolate = PHYSICS_INTERPOLATE
+        self.accumulator = 0.0
+        self.alpha = 1.0  # Fraction of a fixed step the render time is past the latest state
+        self._previous = None  # Snapshot of the state before the latest fixed step
+        self.lod_radius = PHYSICS_LOD_RADIUS
+        self.lod_interval = PHYSICS_LOD_INTERVAL
+        self.sleep_speed = PHYSICS_SLEEP_SPEED
+        self.sleep_delay = PHYSICS_SLEEP_DELAY
+        self.wake_distance = PHYSICS_WAKE_DISTANCE
+        self.wake_margin = PHYSICS_WAKE_MARGIN
+        self._step_count = 0
+        self.collision_margin = PHYSICS_COLLISION_MARGIN
+        self._proximity = SweepAndPrune()
+        self._broadphase = SweepAndPrune()
+
+    def add_bodies(self, bodies):
+        """Start simulating the given SoftBodies (already-owned bodies are ignored)"""
+        for body in bodies:
+            if body._world is self:
+                continue
+            if body._world is not None:
+                body._world.remove_bodies([body])
+            body._world = self
+            body._lod_phase = len(self.bodies) % self.lod_interval
+            body.wake()
+            self.bodies.append(body)
+        self._batch = None
+
+    def remove_bodies(self, bodies):
+        """Stop simulating the given SoftBodies and drop springs attached to them"""
+        removed = {id(b) for b in bodies if b._world is self}
+        if not removed:
+            return
+        for body in bodies:
+            if body._world is self:
+                body._world = None
+                body.wake()
+        self.bodies = [b for b in self.bodies if id(b) not in removed]
+        self.external_springs[:] = [
+            s for s in self.external_springs
+            if id(s.point1.parent) not in removed and id(s.point2.parent) not in removed
+        ]
+        self._batch = None
+
+    def add_springs(self, springs):
+        """Register ExternalSprings between points of owned bodies"""
+        self.external_springs.extend(springs)
+        for spring in springs:
+            spring.point1.parent.wake()
+            spring.point2.parent.wake()
+
+    def remove_springs(self, springs):
+        """Unregister ExternalSprings"""
+        removed = {id(s) for s in springs}
+        self.external_springs[:] = [s for s in self.external_springs if id(s) not in removed]
+
+    def clear(self):
+        """Drop every body and external spring (new game / load)"""
+        for body in self.bodies:
+            body._world = None
+            body.wake()
+        self.bodies = []
+        self.external_springs.clear()
+        self._batch = None
+        self._previous = None
+        self.accumulator = 0.0
+
+    def _ensure_batch(self):
+        if self._batch is None or self._batch.is_stale():
+            self._batch = self.engine.build_batch([b for b in self.bodies if b._physics is not None])
+            self._python_bodies = [b for b in self.bodies if b._physics is None]
+
+    def advance(self, frame_time):
+        """Consume frame_time seconds of real time in fixed steps; returns the steps taken"""
+        self.accumulator += frame_time
+        steps = 0
+        while self.accumulator >= self.timestep and steps < self.max_steps_per_frame:
+            self._capture_previous()
+            for _ in range(self.substeps):
+                self.step(self.timestep / self.substeps)
+            self.accumulator -= self.timestep
+            steps += 1
+        if self.accumulator >= self.timestep:
+            # Too far behind: drop the backlog instead of spiralling
+            self.accumulator %= self.timestep
+        self.alpha = self.accumulator / self.timestep
+        return steps
+
+    def _capture_previous(self):
+        self._ensure_batch()
+        store = self.engine.points
+        self._previous = (
+            self._batch,
+            store.pos[self._batch.point_slots].copy(),
+            [pygame.Vector2(b.center) for b in self._batch.bodies],
+            [(b, [p.pos.copy() for p in b.points], pygame.Vector2(b.center)) for b in self._python_bodies],
+        )
+
+    @contextmanager
+    def interpolated(self):
+        """Temporarily move every body to its interpolated render position"""
+        previous = self._previous
+        if not self.interpolate or previous is None or self.alpha >= 1.0:
+            yield
+            return
+        batch, prev_pos, prev_centers, prev_python = previous
+        alpha = self.alpha
+        store = self.engine.points
+        saved_pos = None
+        saved_points = []
+        saved_centers = []
+
+        if batch is self._batch and not batch.is_stale() and len(batch.point_slots):
+            slots = batch.point_slots
+            saved_pos = store.pos[slots].copy()
+            store.pos[slots] = prev_pos + (saved_pos - prev_pos) * alpha
+            for body, prev_center in zip(batch.bodies, prev_centers):
+                saved_centers.append((body, body.center))
+                body.center = prev_center.lerp(body.center, alpha)
+
+        for body, prev_points, prev_center in prev_python:
+            if len(prev_points) != len(body.points):
+                continue
+            for point, prev in zip(body.points, prev_points):
+                saved_points.append((point, point.pos))
+                point.pos = prev.lerp(point.pos, alpha)
+            saved_centers.append((body, body.center))
+            body.center = prev_center.lerp(body.center, alpha)
+
+        try:
+            yield
+        finally:
+            if saved_pos is not None:
+                store.pos[batch.point_slots] = saved_pos
+            for point, pos in saved_points:
+                point.pos = pos
+            for body, center in saved_centers:
+                body.center = center
+
+    # ---- level of detail ----
+    def set_focus(self, positions):
+        """Mark cells near any of positions (player cells, camera) for full-rate simulation"""
+        focus = np.array([(p[0], p[1]) for p in positions], dtype=float).reshape(-1, 2)
+        if not self.bodies:
+            return
+        if not len(focus):
+            for body in self.bodies:
+                body._lod_far = False
+            return
+        centers = np.array([(b.center.x, b.center.y) for b in self.bodies], dtype=float)
+        nearest = np.full(len(centers), np.inf)
+        for fx, fy in focus.tolist():
+            nearest = np.minimum(nearest, (centers[:, 0] - fx) ** 2 + (centers[:, 1] - fy) ** 2)
+        far = (nearest > self.lod_radius ** 2).tolist()
+        for body, is_far in zip(self.bodies, far):
+            body._lod_far = is_far and not body.is_player
+
+    def lod_delta(self, body, delta_time):
+        """Time to pass to a cell's per-frame AI update, or 0 to skip it this frame.
+
+        Far cells accumulate their frame time and update every lod_interval
+        frames; far cells that are asleep skip AI entirely.
+        """
+        if not body._lod_far:
+            elapsed = body._lod_time + delta_time
+            body._lod_time = 0.0
+            return elapsed
+        if body._asleep:
+            body._lod_time = 0.0
+            return 0.0
+        body._lod_time += delta_time
+        body._lod_frames += 1
+        if body._lod_frames < self.lod_interval:
+            return 0.0
+        elapsed = body._lod_time
+        body._lod_time = 0.0
+        body._lod_frames = 0
+        return elapsed
+
+    def _spring_linked(self):
+        linked = set()
+        for spring in self.external_springs:
+            if spring.active:
+                linked.add(id(spring.point1.parent))
+                linked.add(id(spring.point2.parent))
+        return linked
+
+    def _wake_sleepers(self, linked):
+        """Wake sleeping cells that were displaced, spring-linked or approached"""
+        sleeping = False
+        for body in self.bodies:
+            if not body._asleep:
+                continue
+            sleeping = True
+            if id(body) in linked or not body.points:
+                body.wake()
+            elif body.points[0].pos.distance_to(body._sleep_anchor) > self.wake_distance:
+                body.wake()
+        if not sleeping:
+            return
+        for first, second in self._proximity.pairs(self.bodies, margin=self.wake_margin):
+            if first._asleep != second._asleep:
+                (first if first._asleep else second).wake()
+
+    def _body_delta(self, body, delta_time, linked):
+        """Timestep for body this step under LOD rules (0 = skip)"""
+        if body._asleep:
+            return 0.0
+        if not body._lod_far or id(body) in linked:
+            return delta_time
+        if (self._step_count + body._lod_phase) % self.lod_interval == 0:
+            return delta_time * self.lod_interval
+        return 0.0
+
+    def _update_rest(self, body, old_center, delta_time):
+        """Count how long a cell has stayed still and put it to sleep after sleep_delay"""
+        if body.is_player or not body.points:
+            return
+        if body.center.distance_to(old_center) < self.sleep_speed * delta_time:
+            body._rest_time += delta_time
+            if body._rest_time >= self.sleep_delay:
+                body._asleep = True
+                body._sleep_anchor = pygame.Vector2(body.points[0].pos)
+        else:
+            body._rest_time = 0.0
+
+    def step(self, delta_time):
+        """Advance all owned bodies, external springs and collisions by delta_time"""
+        self._ensure_batch()
+        self._step_count += 1
+        linked = self._spring_linked()
+        self._wake_sleepers(linked)
+
+        batch = self._batch
+        deltas = [self._body_delta(b, delta_time, linked) for b in batch.bodies]
+        stepped = [d > 0 for d in deltas]
+        if all(stepped):
+            active, active_deltas = batch, deltas
+        elif any(stepped):
+            active = batch.subset(stepped)
+            active_deltas = [d for d in deltas if d > 0]
+        else:
+            active, active_deltas = None, []
+        if active is not None:
+            old_centers = [b.center for b in active.bodies]
+            self.engine.step_batch(active, np.array(active_deltas))
+            for body, old_center, body_dt in zip(active.bodies, old_centers, active_deltas):
+                self._update_rest(body, old_center, body_dt)
+
+        for body in self._python_bodies:
+            body_dt = self._body_delta(body, delta_time, linked)
+            if body_dt > 0:
+                old_center = body.center
+                body.step_physics(body_dt)
+                self._update_rest(body, old_center, body_dt)
+
+        # Inter-cell connections
+        for spring in self.external_springs[:]:
+            spring.update(delta_time)
+            if not spring.active:
+                self.external_springs.remove(spring)
+
+        if self.collision_system is not None and len(self.bodies) > 1:
+            awake = [b for b in self.bodies if not b._asleep]
+            if len(awake) > 1:
+                pairs = list(self._broadphase.pairs(awake, margin=self.collision_margin))
+                if pairs:
+                    self.collision_system.detect_and_resolve_collisions(awake, pairs=pairs)
+
+
+def points_in_polygon(points, polygon):
+    """Even-odd ray casting for many points at once.
+
+    points is (P, 2), polygon is (E, 2) vertices in order; returns a (P,) bool
+    array. Uses the same edge rules as SoftBody.point_in_polygon. Backs the
+    legacy SoftBody.resolve_polygon_collisions; PhysicsWorld.step does not use it.
+    """
+    if len(polygon) == 0 or len(points) == 0:
+        return np.zeros(len(points), dtype=bool)
+    x = points[:, 0:1]
+    y = points[:, 1:2]
+    p1 = polygon
+    p2 = np.roll(polygon, -1, axis=0)
+    y1, y2 = p1[:, 1], p2[:, 1]
+    x1, x2 = p1[:, 0], p2[:, 0]
+    dy = y2 - y1
+    safe_dy = np.where(dy != 0, dy, 1.0)
+    crosses = (y > np.minimum(y1, y2)) & (y <= np.maximum(y1, y2)) & (x <= np.maximum(x1, x2))
+    x_inters = (y - y1) * (x2 - x1) / safe_dy + x1
+    hits = crosses & ((x1 == x2) | (x <= x_inters))
+    return (np.count_nonzero(hits, axis=1) % 2) == 1
+
+
+def closest_edge_points(points, polygon):
+    """Closest point on the polygon outline for each point, plus that edge's outward normal.
+
+    Returns (projections, normals), both (P, 2). Normals are flipped to face
+    away from the polygon's vertex average, as in SoftBody.get_closest_edge_point.
+    Points with no usable (non-degenerate) edge get NaN rows.
+    """
+    p1 = polygon
+    edge = np.roll(polygon, -1, axis=0) - p1
+    length_sq = np.einsum("ij,ij->i", edge, edge)
+    valid = length_sq > 0
+    safe_length_sq = np.where(valid, length_sq, 1.0)
+
+    to_point = points[:, None, :] - p1[None, :, :]
+    t = np.clip(np.einsum("pej,ej->pe", to_point, edge) / safe_length_sq, 0.0, 1.0)
+    projection = p1[None, :, :] + edge[None, :, :] * t[:, :, None]
+    offset = points[:, None, :] - projection
+    dist_sq = np.where(valid, np.einsum("pej,pej->pe", offset, offset), np.inf)
+    best = np.argmin(dist_sq, axis=1)
+    rows = np.arange(len(points))
+
+    projections = projection[rows, best]
+    best_edge = edge[best]
+    normals = np.stack((-best_edge[:, 1], best_edge[:, 0]), axis=1) / np.sqrt(safe_length_sq[best])[:, None]
+    center = polygon.mean(axis=0)
+    facing_in = np.einsum("ij,ij->i", projections - center, normals) < 0
+    normals[facing_in] *= -1
+    missing = ~valid[best]
+    projections[missing] = np.nan
+    normals[missing] = np.nan
+    return projections, normals
+
+
+class SweepAndPrune:
+    """Persistent sort-and-sweep broadphase over cell bounding boxes.
+
+    Bodies are kept sorted by the left edge of their aabb. The order carries
+    over between calls, so re-sorting a scene where cells move a little each
+    frame is close to linear, and the sweep only compares cells whose x
+    ranges overlap.
+    """
+
+    def __init__(self):
+        self.bodies = []
+        self._members = set()
+
+    def update(self, bodies):
+        """Sync membership with bodies and restore the sort order"""
+        members = {id(b) for b in bodies}
+        if members != self._members:
+            kept = [b for b in self.bodies if id(b) in members]
+            known = {id(b) for b in kept}
+            kept.extend(b for b in bodies if id(b) not in known)
+            self.bodies = kept
+            self._members = members
+        self.bodies.sort(key=_aabb_left)
+
+    def pairs(self, bodies, margin=0.0):
+        """Yield each pair of bodies whose aabbs, grown by margin, overlap"""
+        self.update(bodies)
+        reach = margin * 2
+        active = []
+        for body in self.bodies:
+            min_x, min_y, max_x, max_y = body.aabb
+            active = [other for other in active if other.aabb[2] + reach >= min_x]
+            for other in active:
+                other_box = other.aabb
+                if other_box[1] <= max_y + reach and min_y <= other_box[3] + reach:
+                    yield other, body
+            active.append(body)
+
+
+def _aabb_left(body):
+    return body.aabb[0]
+
+
+# Shared engine used by every SoftBody when PHYSICS_BACKEND == "numpy"
+engine = SoftBodyEngine()
+
+# Shared broadphase for SoftBody.resolve_polygon_collisions (PhysicsWorld keeps its own)
+broadphase = SweepAndPrune()
@@ -0,0 +1,394 @@
+"""
+Frame-time instrumentation for the game loop.
+
+Named timing scopes wrap each phase of a frame (`with profiler.scope("render"):`).
+Scopes opened inside another scope are recorded under a nested name such as
+"update/physics", so the overlay can show both the phase and its parts. Each
+finished frame becomes one row of a fixed-size ring buffer (NumPy), from which
+the overlay computes rolling mean / p95 / p99 per scope and draws a stacked
+frame-time graph of the top-level scopes.
+
+F3 toggles the overlay, F4 exports the buffer as JSON and Shift+F4 as CSV
+(see main.step).
+
+SamplingProfiler is an optional statistical profiler: a background thread
+grabs the main thread's Python stack every few milliseconds through
+sys._current_frames(), and the samples of each frame are filed under that
+frame's duration bucket (e.g. "33-50ms"), so the cost of slow frames can be
+looked at separately. F5 starts/stops it (or set CELLLAB_SAMPLE=speedscope or
+=collapsed before launching); stopping writes a speedscope JSON file
+(https://www.speedscope.app) or a collapsed-stack file for flamegraph.pl.
+"""
+
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import numpy as np
+import pygame
+
+from config import PROFILER_ENABLED, PROFILER_HISTORY, PROFILER_EXPORT_DIR
+from config import SAMPLER_INTERVAL, SAMPLER_FRAME_BUCKETS, SAMPLER_MAX_DEPTH
+
+GRAPH_COLORS = [
+    (90, 170, 255), (255, 150, 60), (120, 220, 120), (230, 90, 90),
+    (190, 120, 255), (240, 220, 90), (90, 220, 220), (240, 140, 200),
+]
+TARGET_FRAME_MS = 1000.0 / 60.0  # Reference line on the graph
+SAMPLER_ENV_VAR = "CELLLAB_SAMPLE"  # "speedscope" or "collapsed" starts the sampler at launch
+
+
+class FrameProfiler:
+    """Scope timers and a ring buffer of per-frame timings (milliseconds)"""
+
+    def __init__(self, history=PROFILER_HISTORY, enabled=PROFILER_ENABLED, sampler=None):
+        self.enabled = enabled
+        self.sampler = sampler  # Told each frame's duration, to bucket its samples
+        self.overlay_visible = False
+        self.history = history
+        self.names = []  # Scope names, in order of first use
+        self._columns = {}  # name -> column in the buffers
+        self._samples = np.zeros((history, 8))  # ms per scope per frame
+        self._frame_ms = np.zeros(history)
+        self._head = 0  # Next row to write
+        self._count = 0  # Rows filled so far
+        self._current = np.zeros(8)  # Scope totals of the frame in progress
+        self._stack = []  # Names of the open scopes
+        self._frame_start = None
+        self._font = None
+        self._stats_cache = None
+
+    # ---- recording ----
+    @contextmanager
+    def scope(self, name):
+        """Time a block; nested scopes are recorded as parent/name"""
+        if not self.enabled:
+            yield
+            return
+        full_name = f"{self._stack[-1]}/{name}" if self._stack else name
+        self._stack.append(full_name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000.0
+            self._stack.pop()
+            column = self._column(full_name)  # May grow self._current
+            self._current[column] += elapsed
+
+    @contextmanager
+    def frame(self):
+        """Bracket one frame; its scope totals are pushed into the ring buffer on exit"""
+        sampling = self.sampler is not None and self.sampler.running
+        if not self.enabled and not sampling:
+            yield
+            return
+        self._frame_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            frame_ms = (time.perf_counter() - self._frame_start) * 1000.0
+            if self.enabled:
+                self._push(frame_ms)
+            if sampling:
+                self.sampler.end_frame(frame_ms)
+
+    def _column(self, name):
+        column = self._columns.get(name)
+        if column is None:
+            column = len(self.names)
+            if column >= self._current.shape[0]:
+                width = self._current.shape[0] * 2
+                self._samples = np.pad(self._samples, ((0, 0), (0, width - self._samples.shape[1])))
+                self._current = np.pad(self._current, (0, width - self._current.shape[0]))
+            self._columns[name] = column
+            self.names.append(name)
+        return column
+
+    def _push(self, frame_ms):
+        self._samples[self._head] = self._current
+        self._frame_ms[self._head] = frame_ms
+        self._current[:] = 0.0
+        self._head = (self._head + 1) % self.history
+        self._count = min(self._count + 1, self.history)
+
+    def clear(self):
+        self._count = 0
+        self._head = 0
+        self._current[:] = 0.0
+
+    # ---- queries ----
+    def window(self):
+        """(frame_ms, samples) for the recorded frames, oldest first"""
+        if self._count < self.history:
+            rows = slice(0, self._count)
+            return self._frame_ms[rows], self._samples[rows, :len(self.names)]
+        order = np.roll(np.arange(self.history), -self._head)
+        return self._frame_ms[order], self._samples[order, :len(self.names)]
+
+    def stats(self):
+        """{name: (mean, p95, p99)} in ms over the buffer, including "frame" """
+        frame_ms, samples = self.window()
+        if not len(frame_ms):
+            return {}
+        result = {"frame": _summarize(frame_ms)}
+        if self.names:
+            means = samples.mean(axis=0)
+            p95, p99 = np.percentile(samples, [95, 99], axis=0)
+            for i, name in enumerate(self.names):
+                result[name] = (means[i], p95[i], p99[i])
+        return result
+
+    def display_order(self):
+        """Scope names with each parent directly above its children"""
+        def key(name):
+            parts = name.split("/")
+            return [self._columns.get("/".join(parts[:i + 1]), -1) for i in range(len(parts))]
+        return sorted(self.names, key=key)
+
+    # ---- export ----
+    def export(self, path=None, fmt="json"):
+        """Write the buffer to CSV or JSON (chosen by fmt or the path's extension); returns the path"""
+        if path is None:
+            os.makedirs(PROFILER_EXPORT_DIR, exist_ok=True)
+            path = os.path.join(PROFILER_EXPORT_DIR, time.strftime(f"frames_%Y%m%d_%H%M%S.{fmt}"))
+        elif path.endswith(".csv"):
+            fmt = "csv"
+        frame_ms, samples = self.window()
+        if fmt == "csv":
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame", "frame_ms"] + self.names)
+                for i in range(len(frame_ms)):
+                    writer.writerow([i, round(frame_ms[i], 4)] + [round(v, 4) for v in samples[i]])
+        else:
+            data = {
+                "scopes": self.names,
+                "frame_ms": np.round(frame_ms, 4).tolist(),
+                "samples_ms": {name: np.round(samples[:, i], 4).tolist() for i, name in enumerate(self.names)},
+                "summary": {name: dict(zip(("mean", "p95", "p99"), map(float, values)))
+                            for name, values in self.stats().items()},
+            }
+            with open(path, "w") as f:
+                json.dump(data, f, indent=1)
+        return path
+
+    # ---- overlay ----
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self.enabled = True
+
+    def draw(self, surface, pos=None, graph_frames=180):
+        """Draw the per-scope table and stacked frame-time graph"""
+        if self._font is None:
+            self._font = pygame.font.Font(None, 18)
+        # Percentiles over the whole buffer are recomputed a few times a second, not every frame
+        if self._stats_cache is None or self._head % 15 == 0 or self._count < 15:
+            self._stats_cache = self.stats()
+        stats = self._stats_cache
+        top_level = [name for name in self.names if "/" not in name]
+        color_of = {name: GRAPH_COLORS[i % len(GRAPH_COLORS)] for i, name in enumerate(top_level)}
+
+        rows = ["frame"] + self.display_order()
+        width, graph_h = 330, 90
+        # Default: right-hand side, below the header buttons
+        x, y = pos if pos is not None else (surface.get_width() - width - 10, 220)
+        height = 20 + 14 * len(rows) + graph_h + 10
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        surface.blit(panel, (x, y))
+
+        columns = (x + 6, x + 170, x + 225, x + 280)  # scope, mean, p95, p99
+        for cx, label in zip(columns, ("scope (ms)", "mean", "p95", "p99")):
+            surface.blit(self._font.render(label, True, (220, 220, 220)), (cx, y + 4))
+        ty = y + 20
+        for name in rows:
+            values = stats.get(name, (0.0, 0.0, 0.0))
+            depth = name.count("/")
+            color = color_of.get(name, (170, 170, 170) if depth else (255, 255, 255))
+            label = "    " * depth + name.rsplit("/", 1)[-1]
+            surface.blit(self._font.render(label, True, color), (columns[0], ty))
+            for cx, value in zip(columns[1:], values):
+                surface.blit(self._font.render(f"{value:6.2f}", True, color), (cx, ty))
+            ty += 14
+
+        # Stacked graph: one column per recent frame, one colored segment per top-level scope
+        frame_ms, samples = self.window()
+        frame_ms, samples = frame_ms[-graph_frames:], samples[-graph_frames:]
+        gx, gy = x + 6, ty + graph_h
+        scale = graph_h / max(2 * TARGET_FRAME_MS, float(frame_ms.max()) if len(frame_ms) else 0.0)
+        column_w = max(1, (width - 12) // graph_frames)
+        for i in range(len(frame_ms)):
+            base = gy
+            for name in top_level:
+                h = samples[i, self._columns[name]] * scale
+                if h >= 1:
+                    pygame.draw.line(surface, color_of[name], (gx + i * column_w, base), (gx + i * column_w, base - h), column_w)
+                base -= h
+            # Untracked remainder of the frame in grey
+            rest = frame_ms[i] * scale - (gy - base)
+            if rest >= 1:
+                pygame.draw.line(surface, (90, 90, 90), (gx + i * column_w, base), (gx + i * column_w, base - rest), column_w)
+        target_y = gy - TARGET_FRAME_MS * scale
+        pygame.draw.line(surface, (255, 255, 255), (gx, target_y), (x + width - 6, target_y), 1)
+
+
+class SamplingProfiler:
+    """Background thread sampling one thread's Python stack at a fixed interval"""
+
+    def __init__(self, interval=SAMPLER_INTERVAL, buckets=SAMPLER_FRAME_BUCKETS):
+        self.interval = interval
+        self.buckets = buckets  # Frame-time bucket edges in ms
+        self.format = "speedscope"
+        self.running = False
+        self.samples = 0
+        self._thread = None
+        self._stop = threading.Event()
+        self._target = None  # Thread ident being sampled
+        self._pending = []  # Stacks sampled during the current frame
+        self._pending_lock = threading.Lock()  # Held to append to or swap out _pending
+        self._stacks = {}  # bucket label -> Counter of stacks (tuples of code objects, outermost first)
+
+    def start(self, fmt=None):
+        """Start sampling the calling thread"""
+        if self.running:
+            return
+        if fmt in ("speedscope", "collapsed"):
+            self.format = fmt
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._pending = []
+        self._stacks = {}
+        self.samples = 0
+        self.running = True
+        self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+        self._thread.start()
+
+    def start_from_env(self):
+        """Start if the CELLLAB_SAMPLE environment variable is set; returns whether it did"""
+        value = os.environ.get(SAMPLER_ENV_VAR, "").strip().lower()
+        if value and value not in ("0", "false", "off"):
+            self.start(value)
+        return self.running
+
+    def stop(self, export=True):
+        """Stop sampling; returns the exported file's path (or None)"""
+        if not self.running:
+            return None
+        self._stop.set()
+        self._thread.join()
+        self.running = False
+        self._file(self._pending, "untimed")
+        self._pending = []
+        return self.export() if export and self.samples else None
+
+    def toggle(self):
+        """Start, or stop and export; returns the exported path when stopping"""
+        if self.running:
+            return self.stop()
+        self.start()
+        return None
+
+    def end_frame(self, frame_ms):
+        """File the samples taken since the last call under frame_ms's bucket"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+        self._file(pending, self._bucket(frame_ms))
+
+    def _file(self, stacks, label):
+        if stacks:
+            self._stacks.setdefault(label, Counter()).update(stacks)
+
+    def _bucket(self, frame_ms):
+        low = 0
+        for edge in self.buckets:
+            if frame_ms < edge:
+                return f"frames {low:g}-{edge:g}ms"
+            low = edge
+        return f"frames >{low:g}ms"
+
+    def _run(self):
+        current_frames = sys._current_frames
+        while not self._stop.wait(self.interval):
+            frame = current_frames().get(self._target)
+            stack = []
+            while frame is not None and len(stack) < SAMPLER_MAX_DEPTH:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            if stack:
+                stack.reverse()
+                with self._pending_lock:
+                    self._pending.append(tuple(stack))
+                    self.samples += 1
+
+    # ---- export ----
+    def export(self, path=None, fmt=None):
+        """Write the collected samples as speedscope JSON or collapsed stacks; returns the path"""
+        fmt = fmt or ("collapsed" if path and path.endswith(".txt") else self.format)
+        if path is None:
+            os.makedirs(PROFILER_EXPORT_DIR, exist_ok=True)
+            ext = "speedscope.json" if fmt == "speedscope" else "collapsed.txt"
+            path = os.path.join(PROFILER_EXPORT_DIR, time.strftime(f"samples_%Y%m%d_%H%M%S.{ext}"))
+        if fmt == "collapsed":
+            self._write_collapsed(path)
+        else:
+            self._write_speedscope(path)
+        return path
+
+    def _write_collapsed(self, path):
+        # One "bucket;outer;...;inner count" line per distinct stack (flamegraph.pl / speedscope input)
+        with open(path, "w") as f:
+            for label, counter in self._stacks.items():
+                for stack, count in counter.most_common():
+                    names = ";".join(_frame_name(code) for code in stack)
+                    f.write(f"{label};{names} {count}\n")
+
+    def _write_speedscope(self, path):
+        frames, index = [], {}
+        profiles = []
+        interval_ms = self.interval * 1000.0
+        for label, counter in self._stacks.items():
+            samples, weights = [], []
+            for stack, count in counter.most_common():
+                ids = []
+                for code in stack:
+                    if code not in index:
+                        index[code] = len(frames)
+                        frames.append({"name": code.co_name, "file": code.co_filename, "line": code.co_firstlineno})
+                    ids.append(index[code])
+                samples.append(ids)
+                weights.append(count * interval_ms)
+            profiles.append({
+                "type": "sampled", "name": label, "unit": "milliseconds",
+                "startValue": 0, "endValue": sum(weights),
+                "samples": samples, "weights": weights,
+            })
+        data = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": "CellLab sampling profile",
+            "exporter": "profiler.SamplingProfiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+
+def _frame_name(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _summarize(values):
+    p95, p99 = np.percentile(values, [95, 99])
+    return float(values.mean()), float(p95), float(p99)
+
+
+sampler = SamplingProfiler()
+profiler = FrameProfiler(sampler=sampler)
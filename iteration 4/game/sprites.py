@@ -0,0 +1,66 @@
+"""
+Shared sprite caches.
+
+shared_image() is a flyweight registry for base images that many entities
+draw (membrane points, molecules). cached_sprite() is a byte-bounded LRU for
+derived sprites (scaled, tinted, composited) whose keys vary with zoom or
+effects; quantize_zoom() rounds zooms so nearby frames share those sprites.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+from config import SPRITE_ZOOM_STEP, SPRITE_CACHE_BYTES
+
+_shared_images = {}  # key -> Surface, see shared_image
+
+
+def shared_image(key, build):
+    """Flyweight sprite registry: one Surface per key, built by build() on first use.
+
+    Shared surfaces must be treated as read-only; anything that needs its own
+    image (e.g. a point showing an upgrade icon) assigns a private one instead.
+    """
+    image = _shared_images.get(key)
+    if image is None:
+        image = _shared_images[key] = build()
+    return image
+
+
+_cached_sprites = OrderedDict()  # key -> Surface, least recently used first; see cached_sprite
+_cached_sprite_bytes = 0  # Pixel memory held by _cached_sprites
+
+
+def cached_sprite(key, build):
+    """LRU sprite cache: like shared_image, but evicts once SPRITE_CACHE_BYTES is exceeded.
+
+    For derived sprites (scaled, tinted) whose keys vary with zoom or effects.
+    """
+    global _cached_sprite_bytes
+    sprite = _cached_sprites.get(key)
+    if sprite is not None:
+        _cached_sprites.move_to_end(key)
+        return sprite
+    sprite = _cached_sprites[key] = build()
+    _cached_sprite_bytes += sprite.get_width() * sprite.get_height() * sprite.get_bytesize()
+    while _cached_sprite_bytes > SPRITE_CACHE_BYTES and len(_cached_sprites) > 1:
+        _, old = _cached_sprites.popitem(last=False)
+        _cached_sprite_bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+    return sprite
+
+
+def quantize_zoom(zoom, step=SPRITE_ZOOM_STEP):
+    """Zoom rounded to step, so cached sprites and layers are shared between nearby zooms"""
+    return max(step, round(zoom / step) * step)
+
+
+def scaled_sprite(image, size, alpha=None, smooth=False):
+    """image scaled to size (and given a surface alpha), cached by (image, size, alpha)"""
+    def build():
+        scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+        sprite = scale(image, size)
+        if alpha is not None:
+            sprite.set_alpha(alpha)
+        return sprite
+    return cached_sprite(("scaled", image, size, alpha, smooth), build)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Check that chunks evicted under CHUNK_MEMORY_BUDGET come back identically.
+
+A chunk's contents derive only from (world seed, chunk_x, chunk_y); what the
+player changed is kept in a ChunkDelta. After eviction and regeneration a
+chunk must have the same molecules, POI, state and spawn flag as before,
+whichever chunk worker built it.
+"""
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+SEED = 12345
+FAR_AWAY = 10000  # World units; puts the test chunks far outside the render distance
+
+
+def _generator():
+    import pygame
+    from world_generation import WorldGenerator
+
+    return WorldGenerator(seed=SEED), [SimpleNamespace(center=pygame.Vector2(FAR_AWAY * 1000, FAR_AWAY * 1000))]
+
+
+def _evict(generator, player_cells):
+    import world_generation
+
+    budget = world_generation.CHUNK_MEMORY_BUDGET
+    world_generation.CHUNK_MEMORY_BUDGET = 1  # Anything generated is over budget
+    try:
+        generator.evict_far_chunks(player_cells)
+    finally:
+        world_generation.CHUNK_MEMORY_BUDGET = budget
+
+
+def _request(generator, keys, timeout=30.0):
+    """Request keys from the worker pool and wait until all of them are installed"""
+    deadline = time.time() + timeout
+    chunks = {}
+    while len(chunks) < len(keys):
+        assert time.time() < deadline, "chunk generation timed out"
+        for key in keys:
+            if key not in chunks:
+                chunk = generator.request_chunk(*key)
+                if chunk is not None:
+                    chunks[key] = chunk
+        time.sleep(0.01)
+    return chunks
+
+
+def _snapshot(chunk):
+    return {
+        "records": chunk.molecules.alive().tobytes(),
+        "poi_type": chunk.poi_type,
+        "poi_data": chunk.poi_data,
+        "state": chunk.state,
+        "poi_spawned": hasattr(chunk, '_poi_spawned'),
+    }
+
+
+def test_modified_chunk_restored_after_eviction():
+    from world_generation import ChunkState
+
+    generator, player_cells = _generator()
+    # A chunk with a point of interest, so poi_type/poi_data are meaningful
+    key = next((x, 0) for x in range(500) if generator.get_chunk(x, 0).poi_type is not None)
+    chunk = generator.get_chunk(*key)
+
+    first = chunk.molecules.alive()[0]
+    taken = chunk.molecules.take_within(float(first["x"]), float(first["y"]), 0.5)
+    assert len(taken) == 1
+    chunk.state = ChunkState.DISCOVERED
+    chunk._poi_spawned = True
+    before = _snapshot(chunk)
+
+    _evict(generator, player_cells)
+    assert key in generator.evicted and key not in generator.chunks
+
+    restored = _request(generator, [key])[key]
+    assert restored is not chunk
+    assert _snapshot(restored) == before
+
+
+def test_untouched_chunk_regenerates_bit_identical():
+    generator, player_cells = _generator()
+    keys = [(x, y) for x in range(-3, 3) for y in range(-3, 3)]
+    # Built on the main thread by a separate generator with the same seed
+    reference_generator = _generator()[0]
+    reference = {key: reference_generator.get_chunk(*key).molecules.records.tobytes() for key in keys}
+
+    first = _request(generator, keys)
+    assert {key: chunk.molecules.records.tobytes() for key, chunk in first.items()} == reference
+
+    _evict(generator, player_cells)
+    assert all(key in generator.evicted for key in keys)
+    assert all(generator.evicted[key].molecules is None for key in keys)  # Nothing to remember
+
+    # Requested in the opposite order, so chunks tend to land on other workers
+    second = _request(generator, keys[::-1])
+    assert {key: chunk.molecules.records.tobytes() for key, chunk in second.items()} == reference
+
+
+if __name__ == "__main__":
+    try:
+        test_modified_chunk_restored_after_eviction()
+        print("✅ Modified chunk restored identically after eviction")
+        test_untouched_chunk_regenerates_bit_identical()
+        print("✅ Untouched chunks regenerate bit-identical on any worker")
+    except AssertionError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
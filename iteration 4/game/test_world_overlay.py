@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Check that the cached world overlay is not rebuilt while a cell group moves.
+
+The camera zoom of a multi-cell group follows the group's spread, so it
+changes a little every frame. The per-chunk overlay colors must only be
+looked up again when the visible chunk range or a chunk's state changes,
+while the layer itself follows the exact zoom.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+FRAMES = 60
+
+
+def _two_cell_game():
+    from game_core import GameCore
+    from player import PlayerCell
+
+    core = GameCore(mode="singleplayer", seed=7, render=True)
+    game = core.game
+    first = game.player_cells[0]
+    # Middle of a chunk, so the small moves below never change the visible chunk range
+    center = first.center + (500 - first.center.x % 1000, 500 - first.center.y % 1000)
+    game.physics_world.remove_bodies(game.player_cells)
+    game.player_cells[:] = [PlayerCell(center + (-500, 0)), PlayerCell(center + (500, 0))]
+    game.physics_world.add_bodies(game.player_cells)
+    core.step(1.0 / 60.0)
+    return core
+
+
+def _move(cell, offset):
+    for point in cell.points:
+        point.pos = point.pos + offset
+        point.old_pos = point.old_pos + offset
+
+
+def test_overlay_not_rebuilt_while_group_moves():
+    import world_generation
+    from config import CHUNK_SIZE
+
+    core = _two_cell_game()
+    world_map = core.world_map
+    builds = []
+    original = world_generation.WorldMap._chunk_overlay_colors
+
+    def counting_build(self, *args):
+        builds.append(args)
+        return original(self, *args)
+
+    world_generation.WorldMap._chunk_overlay_colors = counting_build
+    zooms = []
+    try:
+        left, right = core.player_cells
+        for frame in range(FRAMES):
+            # Drift the group and let its spread breathe by a few units (zoom stays near 0.45)
+            step = 0.25 if (frame // 10) % 2 == 0 else -0.25
+            _move(left, (2, step))
+            _move(right, (2 + step, step))
+            core.step(1.0 / 60.0)
+            zooms.append(core.game.camera.zoom)
+    finally:
+        world_generation.WorldMap._chunk_overlay_colors = original
+
+    assert len(set(zooms)) > FRAMES // 2, "camera zoom should change while the group moves"
+    assert len(builds) <= 1, f"overlay colors rebuilt {len(builds)} times in {FRAMES} frames"
+    # Chunk edges are placed with the camera's exact zoom, like the entities drawn on top
+    min_chunk_x, max_chunk_x = world_map._overlay_colors_key[:2]
+    columns = max_chunk_x - min_chunk_x + 1
+    assert world_map._overlay_size[0] == round(columns * CHUNK_SIZE[0] * zooms[-1])
+
+
+if __name__ == "__main__":
+    try:
+        test_overlay_not_rebuilt_while_group_moves()
+        print("✅ World overlay stays cached while a cell group moves")
+    except AssertionError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
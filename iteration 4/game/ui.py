@@ -5,6 +5,7 @@ from config import WORLD_BOUNDS
 from upgrade import BuyableProteinUpgrade, OrganelleUpgrade, craft_protein, buy_protein, buy_organelle, CraftedProteinUpgrade, generate_protein_boosts, generate_protein_name, generate_protein_desc
 from world_generation import ChunkState
 import webbrowser
+import numpy as np
 
 pygame.init()
 
@@ -1994,9 +1995,9 @@ class MapUI:
         for chunk_x in range(min_chunk_x, max_chunk_x + 1):
             for chunk_y in range(min_chunk_y, max_chunk_y + 1):
                 # Render all chunks, including undiscovered ones (as black)
-                chunk_key = (chunk_x, chunk_y)
-                if chunk_key in self.world_map.world_generator.chunks:
-                    chunk = self.world_map.world_generator.chunks[chunk_key]
+                # Evicted chunks are drawn from the delta they left behind
+                chunk = self.world_map.world_generator.get_chunk_or_delta(chunk_x, chunk_y)
+                if chunk is not None:
                     self.render_chunk(surface, chunk)
                 else:
                     # Create a temporary undiscovered chunk for rendering
@@ -2096,8 +2097,9 @@ class MapUI:
             chunk_y = int(entity_pos.y // csy)
             if not (min_chunk_x <= chunk_x <= max_chunk_x and min_chunk_y <= chunk_y <= max_chunk_y):
                 continue
-            chunk = self.world_map.get_chunk_at_world_pos(entity_pos)
-            if chunk.state == 2:
+            # Generated chunk or evicted chunk's delta; skip chunks that were never generated
+            chunk = self.world_map.world_generator.get_chunk_or_delta(chunk_x, chunk_y)
+            if chunk is not None and chunk.state == 2:
                 pos = self.world_to_map_screen(entity_pos)
                 if 0 <= pos.x < SCREEN_WIDTH and 0 <= pos.y < SCREEN_HEIGHT:
                     if hasattr(entity, 'is_player') and not entity.is_player:
@@ -2111,6 +2113,26 @@ class MapUI:
                     radius = max(1, int(base_radius / self.map_zoom))
                     pygame.draw.circle(surface, color, (int(pos.x), int(pos.y)), radius)
 
+    def render_molecules(self, surface, records):
+        """Draw molecules lying in cell-viewed chunks as yellow dots, straight from their records"""
+        if not len(records):
+            return
+        csx, csy = CHUNK_SIZE
+        scale = SCREEN_WIDTH / (100000 * self.map_zoom)
+        xs = (records["x"] - self.map_center.x) * scale + SCREEN_WIDTH / 2
+        ys = (records["y"] - self.map_center.y) * scale + SCREEN_HEIGHT / 2
+        on_screen = np.flatnonzero((xs >= 0) & (xs < SCREEN_WIDTH) & (ys >= 0) & (ys < SCREEN_HEIGHT))
+        if not len(on_screen):
+            return
+        radius = max(1, int(15 * 0.05 / self.map_zoom))  # Same scaling as other entities
+        chunks = self.world_map.world_generator.chunks
+        chunk_xs = (records["x"][on_screen] // csx).astype(int)
+        chunk_ys = (records["y"][on_screen] // csy).astype(int)
+        for i, cx, cy in zip(on_screen, chunk_xs, chunk_ys):
+            chunk = chunks.get((cx, cy))
+            if chunk is not None and chunk.state == ChunkState.CELL_VIEWED:
+                pygame.draw.circle(surface, (255, 255, 0), (int(xs[i]), int(ys[i])), radius)
+
     def open_map(self):
         """Open the map interface"""
         self.is_open = True
@@ -2247,8 +2269,8 @@ class MapUI:
         surface.blit(coord_surface, (SCREEN_WIDTH - 200, 10))
         surface.blit(zoom_surface, (SCREEN_WIDTH - 200, 30))
     
-    def draw(self, surface, player_cells, all_entities):
-        """Draw the complete map interface"""
+    def draw(self, surface, player_cells, all_entities, molecules=None):
+        """Draw the complete map interface; molecules are world molecule records (molecule.MOLECULE_DTYPE)"""
         if not self.is_open:
             return
             
@@ -2263,6 +2285,8 @@ class MapUI:
         
         # Render entities
         self.render_entities(surface, player_cells, all_entities)
+        if molecules is not None:
+            self.render_molecules(surface, molecules)
         
         # Render UI elements
         self.render_legend(surface)
@@ -14,6 +14,11 @@ import math
 import time
 from typing import Tuple, List, Optional
 
+import numpy as np
+
+from config import SPRITE_BRIGHTNESS_STEP
+from sprites import cached_sprite, scaled_sprite, quantize_zoom
+
 class ColorPalette:
     """Generates and manages cohesive color palettes based on oceanic themes"""
     
@@ -275,80 +280,52 @@ def draw_cell_with_effects(surface: pygame.Surface, cell, camera, delta_time: fl
     # Apply smooth color oscillation using sin/cos functions - restored to original values
     time_factor = (time.time() * 0.5)  # Slow oscillation
     brightness_mod = (math.sin(time_factor) * 0.3 + 1.0)  # Oscillate between 0.7 and 1.3
+    # Rounded so every cell of a color shares cached glow sprites and layer colors this frame
+    brightness_mod = round(brightness_mod / SPRITE_BRIGHTNESS_STEP) * SPRITE_BRIGHTNESS_STEP
     
     # Apply brightness modulation to base color
     oscillated_color = tuple(max(0, min(255, int(c * brightness_mod))) for c in base_color)
     
-    # Convert points to screen coordinates
-    screen_points = []
-    for point in cell.points:
-        if hasattr(point, 'pos'):
-            screen_points.append(camera.world_to_screen(point.pos))
+    # Convert points to screen coordinates (one batched transform)
+    screen_array = camera.world_to_screen_array(cell.point_array())
+    screen_points = screen_array.tolist()
     
     if len(screen_points) < 3:
         # Not enough points to draw polygon, fallback to basic drawing
         cell.draw(surface, camera)
         return
     
-    # Draw multiple transparency layers for depth using the actual cell shape
-    for layer in range(3):
-        alpha = 40 + (layer * 30)  # Varying alpha for depth
-        size_multiplier = 1.0 + (layer * 0.05)
-        
-        # Adjust color slightly for each layer using oscillated base color
-        layer_color = tuple(max(0, min(255, c + layer * 15)) for c in oscillated_color)
-        
-        # Calculate expanded points for this layer
-        if size_multiplier != 1.0:
-            center_screen = camera.world_to_screen(cell.center)
-            expanded_points = []
-            for point in screen_points:
-                # Expand outward from center
-                dx = point[0] - center_screen[0]
-                dy = point[1] - center_screen[1]
-                expanded_x = center_screen[0] + dx * size_multiplier
-                expanded_y = center_screen[1] + dy * size_multiplier
-                expanded_points.append((expanded_x, expanded_y))
-        else:
-            expanded_points = screen_points
-        
-        # Create surface for this layer
-        min_x = min(p[0] for p in expanded_points) - 10
-        max_x = max(p[0] for p in expanded_points) + 10
-        min_y = min(p[1] for p in expanded_points) - 10
-        max_y = max(p[1] for p in expanded_points) + 10
-        
-        layer_width = int(max_x - min_x)
-        layer_height = int(max_y - min_y)
-
-        MAX_LAYER_SIZE = 2048  # Prevent out-of-memory by limiting surface size
-        if 0 < layer_width <= MAX_LAYER_SIZE and 0 < layer_height <= MAX_LAYER_SIZE:
-            layer_surf = pygame.Surface((layer_width, layer_height), pygame.SRCALPHA)
-            # Adjust points relative to surface
-            relative_points = [(p[0] - min_x, p[1] - min_y) for p in expanded_points]
-
-            try:
-                pygame.draw.polygon(layer_surf, (*layer_color, alpha), relative_points)
-                surface.blit(layer_surf, (min_x, min_y), special_flags=pygame.BLEND_ALPHA_SDL2)
-            except ValueError:
-                # If polygon drawing fails, skip this layer
-                pass
-        # If layer is too large, skip drawing to avoid memory crash
-    
-    # Draw the cell's individual points with effects
-    for point in cell.points:
-        if hasattr(point, 'pos'):
-            point_screen_pos = camera.world_to_screen(point.pos)
+    # How far a point's drawing reaches past its position: protein icons up to 20px, glows 2x radius
+    largest_radius = max(getattr(point, 'radius', 3) for point in cell.points)
+    margin = max(20 * max(0.4, camera.zoom), 2 * largest_radius * camera.zoom) + 4
+    
+    # Skip cells whose outermost layer (5% per layer, +10px padding) and point glows are entirely off screen
+    center_screen = camera.world_to_screen(cell.center)
+    extent = np.abs(screen_array - (center_screen.x, center_screen.y)).max(axis=0) * 1.1 + 10
+    if not camera.rect_visible(center_screen.x - extent[0], center_screen.y - extent[1],
+                               center_screen.x + extent[0], center_screen.y + extent[1], margin):
+        return
+    
+    # All three translucent layers go into one pooled surface with a single blit
+    _draw_cell_layers(surface, screen_array, center_screen, oscillated_color)
+    
+    # Draw the cell's individual points with effects (only those on screen)
+    on_screen = camera.visible_mask(screen_array, margin)
+    glows = []  # Membrane glow blits, flushed before anything drawn on top of them
+    for point, point_screen_pos, visible in zip(cell.points, screen_points, on_screen.tolist()):
+        if visible:
             point_radius = max(1, int(getattr(point, 'radius', 3) * camera.zoom))
 
             # If this point is a protein, draw its image/icon
             if (hasattr(point, 'type') and point.type == 'protein') or (hasattr(point, 'is_protein') and point.is_protein):
+                if glows:
+                    surface.blits(glows, doreturn=False)
+                    glows = []
                 # Draw protein image with alpha and scaling
                 if hasattr(point, 'image') and point.image:
-                    scale = max(0.4, camera.zoom)
+                    scale = max(0.4, quantize_zoom(camera.zoom))
                     scaled_size = int(20 * scale)
-                    img = pygame.transform.scale(point.image, (scaled_size, scaled_size))
-                    img.set_alpha(200)
+                    img = scaled_sprite(point.image, (scaled_size, scaled_size), alpha=200)
                     img_rect = img.get_rect(center=point_screen_pos)
                     surface.blit(img, img_rect)
                     # Draw outline for visibility
@@ -360,13 +337,90 @@ def draw_cell_with_effects(surface: pygame.Surface, cell, camera, delta_time: fl
                     pygame.draw.circle(surface, (*point_color, 200), point_screen_pos, point_radius)
             else:
                 # Draw regular membrane point with oscillated color and glow
-                point_color = oscillated_color
-                if point_radius > 0:
-                    point_surf = pygame.Surface((point_radius * 4, point_radius * 4), pygame.SRCALPHA)
-                    pygame.draw.circle(point_surf, (*point_color, 200), (point_radius * 2, point_radius * 2), point_radius)
-                    pygame.draw.circle(point_surf, (*point_color, 80), (point_radius * 2, point_radius * 2), point_radius * 2)
-                    surface.blit(point_surf, (point_screen_pos[0] - point_radius * 2, point_screen_pos[1] - point_radius * 2))
+                glow = _glow_sprite(oscillated_color, point_radius)
+                glows.append((glow, (point_screen_pos[0] - point_radius * 2, point_screen_pos[1] - point_radius * 2)))
+    if glows:
+        surface.blits(glows, doreturn=False)
+
+
+MAX_LAYER_SIZE = 2048  # Prevent out-of-memory by limiting the layer surface size
+_layer_pool = {}  # Bucketed side length -> reusable SRCALPHA surface for cell layers
+_layer_colors = {}  # Oscillated cell color -> composited RGBA of the outer, middle and inner layer regions
+
+
+def _draw_cell_layers(surface, screen_array, center_screen, oscillated_color):
+    """Draw the three depth layers of a cell shape (each 5% larger than the last) in one blit.
+    
+    The layers are nested, so instead of blending three surfaces the regions
+    are painted outermost first with the precomputed color of every layer
+    composited over it.
+    """
+    center = np.array((center_screen[0], center_screen[1]))
+    layer_points = [center + (screen_array - center) * (1.0 + layer * 0.05) for layer in range(3)]
+    
+    # Bounding box of the largest layer, with padding
+    min_x, min_y = layer_points[2].min(axis=0) - 10
+    max_x, max_y = layer_points[2].max(axis=0) + 10
+    layer_width = int(max_x - min_x)
+    layer_height = int(max_y - min_y)
+    if not (0 < layer_width <= MAX_LAYER_SIZE and 0 < layer_height <= MAX_LAYER_SIZE):
+        return  # If layer is too large, skip drawing to avoid memory crash
+    
+    layer_surf = _layer_surface(max(layer_width, layer_height))
+    area = pygame.Rect(0, 0, layer_width, layer_height)
+    layer_surf.fill((0, 0, 0, 0), area)
+    offset = (min_x, min_y)
+    try:
+        for points, color in zip(reversed(layer_points), _cell_layer_colors(oscillated_color)):
+            pygame.draw.polygon(layer_surf, color, (points - offset).tolist())
+        surface.blit(layer_surf, (min_x, min_y), area, special_flags=pygame.BLEND_ALPHA_SDL2)
+    except ValueError:
+        # If polygon drawing fails, skip the layers
+        pass
+
+
+def _layer_surface(size):
+    """Pooled layer surface at least size pixels square (sides are bucketed to powers of two)"""
+    side = 64
+    while side < size:
+        side *= 2
+    layer_surf = _layer_pool.get(side)
+    if layer_surf is None:
+        layer_surf = _layer_pool[side] = pygame.Surface((side, side), pygame.SRCALPHA)
+    return layer_surf
+
+
+def _cell_layer_colors(oscillated_color):
+    """RGBA of the outer, middle and inner layer regions, as if each layer were blended over the ones below"""
+    colors = _layer_colors.get(oscillated_color)
+    if colors is None:
+        layers = []
+        for layer in range(3):
+            alpha = 40 + (layer * 30)  # Varying alpha for depth
+            # Adjust color slightly for each layer using oscillated base color
+            layer_color = tuple(max(0, min(255, c + layer * 15)) for c in oscillated_color)
+            layers.append((*layer_color, alpha))
+        colors = []
+        # Region covered by layers `first` and above; "over" compositing with premultiplied channels
+        for first in (2, 1, 0):
+            alpha, premultiplied = 0.0, [0.0, 0.0, 0.0]
+            for r, g, b, a in layers[first:]:
+                a /= 255.0
+                premultiplied = [c * a + p * (1.0 - a) for c, p in zip((r, g, b), premultiplied)]
+                alpha = a + alpha * (1.0 - a)
+            colors.append(tuple(round(p / alpha) for p in premultiplied) + (round(alpha * 255),))
+        _layer_colors[oscillated_color] = colors
+    return colors
+
 
+def _glow_sprite(color, point_radius):
+    """Cached glow dot of a membrane point for one color and on-screen radius"""
+    def build():
+        point_surf = pygame.Surface((point_radius * 4, point_radius * 4), pygame.SRCALPHA)
+        pygame.draw.circle(point_surf, (*color, 200), (point_radius * 2, point_radius * 2), point_radius)
+        pygame.draw.circle(point_surf, (*color, 80), (point_radius * 2, point_radius * 2), point_radius * 2)
+        return point_surf
+    return cached_sprite(("cell_glow", color, point_radius), build)
 
 def update_visual_systems(dt: float):
     """Update all visual systems"""
@@ -386,30 +440,66 @@ def draw_molecule_with_effects(surface: pygame.Surface, molecule, camera, delta_
         return
     
     screen_pos = camera.world_to_screen(molecule.pos)
-    
-    # Get base color from palette based on molecule type with more variation
-    if hasattr(molecule, 'type'):
-        if molecule.type == 'protein':
-            base_color = color_palette.get_color(0)
-        elif molecule.type == 'lipid':
-            base_color = color_palette.get_color(1)
-        elif molecule.type == 'nucleic_acid':
-            base_color = color_palette.get_color(2)
-        else:
-            base_color = color_palette.get_color(3)
-    else:
-        base_color = color_palette.get_color(0)
-    
+    _draw_molecule_layers(surface, screen_pos, getattr(molecule, 'type', 'protein'),
+                          getattr(molecule, 'radius', 15), camera.zoom, _molecule_brightness())
+
+
+def draw_molecule_records(surface: pygame.Surface, records, camera, delta_time: float):
+    """Draw world molecules given as molecule.MOLECULE_DTYPE records, skipping any off screen"""
+    from molecule import MOLECULE_KINDS, MOLECULE_RADIUS
+    if not len(records):
+        return
+    screen_points = camera.world_to_screen_array(np.column_stack((records["x"], records["y"])))
+    margin = MOLECULE_RADIUS * camera.zoom * 1.15 + 1  # Outer layer radius
+    visible = np.flatnonzero(camera.visible_mask(screen_points, margin))
+    brightness_mod = _molecule_brightness()
+    # One cached sprite per kind this frame, then a single batched blit
+    sprites = [_molecule_sprite(kind, MOLECULE_RADIUS, camera.zoom, brightness_mod) for kind in MOLECULE_KINDS]
+    halves = [sprite.get_width() // 2 for sprite in sprites]
+    xs, ys = screen_points[visible, 0], screen_points[visible, 1]
+    surface.blits([(sprites[kind], (x - halves[kind], y - halves[kind]), None, pygame.BLEND_ALPHA_SDL2)
+                   for x, y, kind in zip(xs.tolist(), ys.tolist(), records["kind"][visible].tolist())],
+                  doreturn=False)
+
+
+def _molecule_brightness():
     # Apply smooth color oscillation using sin/cos functions
     time_factor = (time.time() * 0.3)  # Slightly different speed for molecules
-    brightness_mod = (math.cos(time_factor) * 0.25 + 1.0)  # Oscillate between 0.75 and 1.25
+    return (math.cos(time_factor) * 0.25 + 1.0)  # Oscillate between 0.75 and 1.25
+
+
+def _draw_molecule_layers(surface, screen_pos, molecule_type, radius, zoom, brightness_mod):
+    sprite = _molecule_sprite(molecule_type, radius, zoom, brightness_mod)
+    half = sprite.get_width() // 2
+    surface.blit(sprite, (screen_pos[0] - half, screen_pos[1] - half), special_flags=pygame.BLEND_ALPHA_SDL2)
+
+
+def _molecule_sprite(molecule_type, radius, zoom, brightness_mod):
+    """Cached sprite of a molecule's glow layers for one on-screen radius and (rounded) brightness"""
+    # Get base color from palette based on molecule type with more variation
+    if molecule_type == 'protein':
+        base_color = color_palette.get_color(0)
+    elif molecule_type == 'lipid':
+        base_color = color_palette.get_color(1)
+    elif molecule_type == 'nucleic_acid':
+        base_color = color_palette.get_color(2)
+    else:
+        base_color = color_palette.get_color(3)
     
+    # Brightness is shared by every molecule in a frame; rounding it lets them share cached sprites
+    brightness_mod = round(brightness_mod / SPRITE_BRIGHTNESS_STEP) * SPRITE_BRIGHTNESS_STEP
+    screen_radius = max(1, int(radius * zoom))
+    return cached_sprite(("molecule_layers", base_color, screen_radius, brightness_mod),
+                         lambda: _build_molecule_layers(base_color, screen_radius, brightness_mod))
+
+
+def _build_molecule_layers(base_color, screen_radius, brightness_mod):
+    """Both translucent molecule layers composited into one sprite"""
     # Apply brightness modulation to base color
     oscillated_color = tuple(max(0, min(255, int(c * brightness_mod))) for c in base_color)
     
-    # Get molecule radius
-    radius = getattr(molecule, 'radius', 15)
-    screen_radius = max(1, int(radius * camera.zoom))
+    outer_radius = int(screen_radius * 1.15)
+    sprite = pygame.Surface((outer_radius * 2, outer_radius * 2), pygame.SRCALPHA)
     
     # Draw multiple transparency layers for depth
     for layer in range(2):  # Fewer layers for molecules
@@ -425,8 +515,8 @@ def draw_molecule_with_effects(surface: pygame.Surface, molecule, camera, delta_
         if layer_radius > 0:
             layer_surf = pygame.Surface((layer_radius * 2, layer_radius * 2), pygame.SRCALPHA)
             pygame.draw.circle(layer_surf, (*layer_color, alpha), (layer_radius, layer_radius), layer_radius)
-            surface.blit(layer_surf, (screen_pos[0] - layer_radius, screen_pos[1] - layer_radius), 
-                        special_flags=pygame.BLEND_ALPHA_SDL2)
+            sprite.blit(layer_surf, (outer_radius - layer_radius, outer_radius - layer_radius))
+    return sprite
 
 
 def create_molecule_particles(molecules: list, camera):
@@ -1,8 +1,12 @@
 import pygame
 import math
 import random
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from config import (CHUNK_SIZE, MAP_SIZE, WORLD_BOUNDS, CELL_VIEW_RANGE, RENDER_DISTANCE,
+from molecule import MoleculeStore, MOLECULE_CLASSES, concat_records
+from config import (CHUNK_SIZE, MAP_SIZE, WORLD_BOUNDS, CELL_VIEW_RANGE, RENDER_DISTANCE, CHUNK_WORKERS, CHUNK_PREFETCH_SECONDS,
+                   CHUNK_MEMORY_BUDGET, BIOME_TILE_CHUNKS,
                    BIOMES, MAP_UNDISCOVERED_COLOR, MAP_DISCOVERED_COLOR, MAP_VIEWED_COLOR, MAP_RED_ZONE_COLOR)
 
 class ChunkState(Enum):
@@ -10,6 +14,10 @@ class ChunkState(Enum):
     DISCOVERED = 1
     CELL_VIEWED = 2
 
+CHUNK_OVERHEAD_BYTES = 2048  # Rough size of a Chunk object, its dicts and Rects, excluding molecule records
+BIOME_NAMES = ("cold", "warm", "hot")  # Biome ids used by the biome tiles
+BIOME_THRESHOLDS = np.array([0.33, 0.66])  # Noise values where the next biome starts
+
 class NoiseGenerator:
     """Simple noise generator for procedural world generation"""
     
@@ -17,7 +25,6 @@ class NoiseGenerator:
         if seed is None:
             seed = random.randint(0, 1000000)
         self.seed = seed
-        random.seed(seed)
         
     def noise2d(self, x, y, scale=1.0):
         """Generate 2D noise value between 0 and 1"""
@@ -41,6 +48,33 @@ class NoiseGenerator:
             
         # Normalize to 0-1 range
         return max(0.0, min(1.0, (value + 1.0) / 2.0))
+    
+    def noise_grid(self, xs, ys, scale=1.0):
+        """noise2d over NumPy arrays (broadcast together); matches the scalar version exactly"""
+        xs = np.asarray(xs, dtype=np.float64) * scale
+        ys = np.asarray(ys, dtype=np.float64) * scale
+        n = np.mod((xs * 57 + ys * 131 + self.seed * 37).astype(np.int64), 2147483647).astype(np.uint64)
+        n = (n << np.uint64(13)) ^ n
+        # Only the low 31 bits are kept, so wrapping uint64 arithmetic gives the big-int result
+        with np.errstate(over='ignore'):
+            n = n * (n * n * np.uint64(15731) + np.uint64(789221)) + np.uint64(1376312589)
+        return 1.0 - (n & np.uint64(0x7fffffff)).astype(np.float64) / 1073741824.0
+    
+    def fractal_noise_grid(self, xs, ys, octaves=4, persistence=0.5, scale=1.0):
+        """fractal_noise2d over NumPy arrays, e.g. a whole rectangle of chunk coordinates at once"""
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        value = np.zeros(np.broadcast(xs, ys).shape)
+        amplitude = 1.0
+        frequency = scale
+        
+        for _ in range(octaves):
+            value += self.noise_grid(xs * frequency, ys * frequency) * amplitude
+            amplitude *= persistence
+            frequency *= 2.0
+            
+        # Normalize to 0-1 range
+        return np.clip((value + 1.0) / 2.0, 0.0, 1.0)
 
 class Chunk:
     """Represents a single chunk of the world"""
@@ -50,34 +84,23 @@ class Chunk:
         self.chunk_y = y
         self.state = ChunkState.UNDISCOVERED
         self.biome = None
-        self.entities = []  # Entities within this chunk
-        self.molecules = []  # Molecules generated for this chunk
+        self.molecules = MoleculeStore()  # Molecules lying in this chunk (record array)
         self.world_generator = world_generator
         self.poi_type = None  # Point of Interest type
         self.poi_data = None  # Additional POI data
+        # Contents depend only on (world seed, chunk_x, chunk_y), so an evicted chunk rebuilds identically
+        rng = world_generator.chunk_rng(x, y)
         self._generate_biome()
-        self._generate_poi()  # Generate POI before molecules
-        self._generate_molecules()
+        self._generate_poi(rng)  # Generate POI before molecules
+        self._generate_molecules(rng)
+        self._generated_version = self.molecules.version  # Molecule store untouched since generation
         
     def _generate_biome(self):
         """Generate biome for this chunk based on noise"""
-        # Use chunk coordinates for biome generation with medium frequency for medium-sized biomes
-        noise_value = self.world_generator.noise_gen.fractal_noise2d(
-            self.chunk_x * 0.05, self.chunk_y * 0.05, octaves=3, scale=0.02
-        )
-        
-        # Assign biome based on noise value
-        if noise_value < 0.33:
-            self.biome = "cold"
-        elif noise_value < 0.66:
-            self.biome = "warm"
-        else:
-            self.biome = "hot"
-    
-    def _generate_poi(self):
-        """Generate Points of Interest with semi-rare chance"""
-        import random
-        
+        self.biome = self.world_generator.chunk_biome(self.chunk_x, self.chunk_y)
+    
+    def _generate_poi(self, random):
+        """Generate Points of Interest with semi-rare chance (random is the chunk's RNG)"""
     # Increase POI chance (about 8% of chunks)
         if random.random() < 0.08:
             poi_types = ["molecule_abundance", "virus_cluster", "giant_enemy"]
@@ -103,11 +126,8 @@ class Chunk:
                     "radius": 500
                 }
 
-    def _generate_molecules(self):
-        """Generate molecules for this chunk"""
-        import random
-        from molecule import Protein, Lipid, NucleicAcid, Carbohydrate
-        
+    def _generate_molecules(self, random):
+        """Generate molecules for this chunk (random is the chunk's RNG)"""
         # Base number of molecules per chunk
         molecules_per_chunk = 15
         
@@ -127,17 +147,18 @@ class Chunk:
             if self.poi_type == "molecule_abundance":
                 molecule_type = self.poi_data["molecule_type"]
             else:
-                molecule_type = random.choice([Protein, Lipid, NucleicAcid, Carbohydrate])
+                molecule_type = random.choice(MOLECULE_CLASSES)
             
-            molecule = molecule_type(pos)
-            self.molecules.append(molecule)
+            # Stored as a record, not a molecule entity
+            kind = MOLECULE_CLASSES.index(molecule_type)
+            self.molecules.add(x, y, kind, random.randint(1, 3))
     
     def spawn_poi_entities(self):
         """Spawn POI-specific entities when chunk is discovered"""
         if self.poi_type == "virus_cluster" and not hasattr(self, '_poi_spawned'):
-            import random
             from virus import CapsidVirus, FilamentousVirus, PhageVirus
             
+            random = self.world_generator.chunk_rng(self.chunk_x, self.chunk_y, "poi")
             virus_type = self.poi_data["virus_type"]
             cluster_count = self.poi_data["cluster_count"]
             world_rect = self.world_rect
@@ -159,6 +180,7 @@ class Chunk:
                 self.pending_virus_spawns.append(spawn_data)
             
             self._poi_spawned = True
+            self.world_generator.poi_spawn_queue.append(self)
             
         elif self.poi_type == "giant_enemy" and not hasattr(self, '_poi_spawned'):
             world_rect = self.world_rect
@@ -177,6 +199,7 @@ class Chunk:
                 }
             
             self._poi_spawned = True
+            self.world_generator.poi_spawn_queue.append(self)
     
     @property
     def world_pos(self):
@@ -193,18 +216,54 @@ class Chunk:
         """Check if world position is within this chunk"""
         return self.world_rect.collidepoint(world_pos)
     
-    def update_entities(self, all_entities):
-        """Update list of entities within this chunk"""
-        self.entities.clear()
-        chunk_rect = self.world_rect
-        
-        for entity in all_entities:
-            if hasattr(entity, 'center'):
-                if chunk_rect.collidepoint(entity.center):
-                    self.entities.append(entity)
-            elif hasattr(entity, 'pos'):
-                if chunk_rect.collidepoint(entity.pos):
-                    self.entities.append(entity)
+    @property
+    def entities(self):
+        """Entities within this chunk (from the generator's entity index)"""
+        return self.world_generator.entities_in_chunk(self.chunk_x, self.chunk_y)
+    
+    def memory_size(self):
+        """Approximate bytes held by this chunk"""
+        return CHUNK_OVERHEAD_BYTES + self.molecules.records.nbytes
+
+class ChunkDelta:
+    """What an evicted chunk remembers: everything else is regenerated from the world seed.
+    
+    biome and poi_type are derivable too, but are kept so the map can draw
+    evicted chunks without rebuilding them.
+    """
+    __slots__ = ("chunk_x", "chunk_y", "state", "biome", "poi_type", "poi_spawned", "molecules")
+    
+    def __init__(self, chunk):
+        self.chunk_x = chunk.chunk_x
+        self.chunk_y = chunk.chunk_y
+        self.state = chunk.state
+        self.biome = chunk.biome
+        self.poi_type = chunk.poi_type
+        self.poi_spawned = hasattr(chunk, '_poi_spawned')
+        # Molecule records only if some were collected (or added) since generation
+        self.molecules = chunk.molecules if chunk.molecules.version != chunk._generated_version else None
+    
+    @property
+    def world_rect(self):
+        return pygame.Rect(self.chunk_x * CHUNK_SIZE[0], self.chunk_y * CHUNK_SIZE[1], CHUNK_SIZE[0], CHUNK_SIZE[1])
+    
+    def apply(self, chunk):
+        """Restore the recorded changes onto a freshly regenerated chunk"""
+        chunk.state = self.state
+        if self.poi_spawned:
+            chunk._poi_spawned = True
+        if self.molecules is not None:
+            chunk.molecules = self.molecules
+            chunk._generated_version = None  # Still differs from the generated layout
+
+_chunk_executor = None  # Worker pool shared by all world generators, created on first use
+
+def chunk_executor():
+    """Thread pool that builds chunk contents off the main loop"""
+    global _chunk_executor
+    if _chunk_executor is None:
+        _chunk_executor = ThreadPoolExecutor(max_workers=CHUNK_WORKERS, thread_name_prefix="chunkgen")
+    return _chunk_executor
 
 class WorldGenerator:
     """Manages procedural world generation and chunk system"""
@@ -212,19 +271,191 @@ class WorldGenerator:
     def __init__(self, seed=None):
         self.noise_gen = NoiseGenerator(seed)
         self.chunks = {}  # Dict of (chunk_x, chunk_y) -> Chunk
+        self.pending = {}  # (chunk_x, chunk_y) -> Future of a Chunk being generated in the background
+        self.evicted = {}  # (chunk_x, chunk_y) -> ChunkDelta of chunks dropped to stay under CHUNK_MEMORY_BUDGET
+        self.memory_used = 0  # Approximate bytes held by self.chunks
+        self.revision = 0  # Bumped whenever a chunk is added to or evicted from self.chunks
+        self.biome_tiles = {}  # (tile_x, tile_y) -> BIOME_TILE_CHUNKS^2 array of biome ids (index into BIOME_NAMES)
         self.loaded_chunks = set()  # Currently loaded chunks
+        self.chunk_entities = {}  # (chunk_x, chunk_y) -> set of entities in that chunk
+        self._entity_chunk = {}  # entity -> (chunk_x, chunk_y) it is indexed under
+        self.viewed_keys = set()  # Chunks currently in some cell's view range (state CELL_VIEWED)
+        self.poi_spawn_queue = []  # Chunks with pending POI spawns for main.process_poi_spawns
         
+    @property
+    def seed(self):
+        return self.noise_gen.seed
+    
+    def chunk_rng(self, chunk_x, chunk_y, stream="content"):
+        """Random generator private to one chunk, seeded from (world seed, stream, chunk_x, chunk_y)"""
+        return random.Random(f"{self.seed}:{stream}:{chunk_x}:{chunk_y}")
+    
+    def chunk_biome(self, chunk_x, chunk_y):
+        """Biome name of a chunk, from the cached biome tiles (no chunk is created)"""
+        tile_x, local_x = divmod(chunk_x, BIOME_TILE_CHUNKS)
+        tile_y, local_y = divmod(chunk_y, BIOME_TILE_CHUNKS)
+        tile = self.biome_tiles.get((tile_x, tile_y))
+        if tile is None:
+            tile = self._build_biome_tile(tile_x, tile_y)
+        return BIOME_NAMES[tile[local_x, local_y]]
+    
+    def _build_biome_tile(self, tile_x, tile_y):
+        """Evaluate the biome noise for one tile of chunks in a single batch"""
+        offsets = np.arange(BIOME_TILE_CHUNKS)
+        chunk_xs = (tile_x * BIOME_TILE_CHUNKS + offsets)[:, None]
+        chunk_ys = (tile_y * BIOME_TILE_CHUNKS + offsets)[None, :]
+        # Use chunk coordinates for biome generation with medium frequency for medium-sized biomes
+        noise = self.noise_gen.fractal_noise_grid(chunk_xs * 0.05, chunk_ys * 0.05, octaves=3, scale=0.02)
+        # Assign biome based on noise value (worker threads may race here; both build the same tile)
+        tile = np.searchsorted(BIOME_THRESHOLDS, noise, side='right').astype(np.uint8)
+        self.biome_tiles[(tile_x, tile_y)] = tile
+        return tile
+    
     def get_chunk_coords(self, world_pos):
         """Convert world position to chunk coordinates"""
         x, y = world_pos
         return (int(x // CHUNK_SIZE[0]), int(y // CHUNK_SIZE[1]))
     
+    def update_entity_index(self, entities):
+        """Re-bucket entities into chunk_entities; only those that crossed a chunk boundary move.
+        
+        Entities missing from `entities` (dead or despawned) are dropped from the index.
+        """
+        previous = self._entity_chunk
+        current = {}
+        for entity in entities:
+            if hasattr(entity, 'center'):
+                pos = entity.center
+            elif hasattr(entity, 'pos'):
+                pos = entity.pos
+            else:
+                continue
+            key = self.get_chunk_coords(pos)
+            old_key = previous.pop(entity, None)
+            if old_key != key:
+                if old_key is not None:
+                    self._unindex(entity, old_key)
+                self.chunk_entities.setdefault(key, set()).add(entity)
+            current[entity] = key
+        for entity, key in previous.items():
+            self._unindex(entity, key)
+        self._entity_chunk = current
+    
+    def _unindex(self, entity, key):
+        members = self.chunk_entities.get(key)
+        if members is not None:
+            members.discard(entity)
+            if not members:
+                del self.chunk_entities[key]
+    
+    def entities_in_chunk(self, chunk_x, chunk_y):
+        """Set of indexed entities in a chunk (treat as read-only)"""
+        return self.chunk_entities.get((chunk_x, chunk_y), frozenset())
+    
     def get_chunk(self, chunk_x, chunk_y):
-        """Get or create chunk at given coordinates"""
+        """Get or create chunk at given coordinates (blocks if it has to be generated)"""
         key = (chunk_x, chunk_y)
-        if key not in self.chunks:
-            self.chunks[key] = Chunk(chunk_x, chunk_y, self)
-        return self.chunks[key]
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            future = self.pending.pop(key, None)
+            chunk = future.result() if future is not None else Chunk(chunk_x, chunk_y, self)
+            self._install(key, chunk)
+        return chunk
+    
+    def request_chunk(self, chunk_x, chunk_y):
+        """Chunk at given coordinates if generated, else None after queueing it for the worker pool"""
+        key = (chunk_x, chunk_y)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            return chunk
+        future = self.pending.get(key)
+        if future is None:
+            self.pending[key] = chunk_executor().submit(Chunk, chunk_x, chunk_y, self)
+        elif future.done():
+            del self.pending[key]
+            chunk = future.result()
+            self._install(key, chunk)
+        return chunk
+    
+    def collect_generated(self):
+        """Move chunks finished by the worker pool into self.chunks"""
+        for key in [key for key, future in self.pending.items() if future.done()]:
+            self._install(key, self.pending.pop(key).result())
+    
+    def _install(self, key, chunk):
+        """Add a generated chunk, restoring its delta if it was evicted before"""
+        delta = self.evicted.pop(key, None)
+        if delta is not None:
+            delta.apply(chunk)
+        self.chunks[key] = chunk
+        chunk.charged_bytes = chunk.memory_size()  # What memory_used was charged, refunded on eviction
+        self.memory_used += chunk.charged_bytes
+        self.revision += 1
+    
+    def evict_far_chunks(self, player_cells):
+        """Drop the chunks farthest from the player cells while over CHUNK_MEMORY_BUDGET.
+        
+        Chunks in view, within render distance or with POI spawns still queued
+        are kept. Evicted chunks leave a ChunkDelta and are rebuilt on demand.
+        """
+        if self.memory_used <= CHUNK_MEMORY_BUDGET or not player_cells:
+            return
+        centers = [self.get_chunk_coords(cell.center) for cell in player_cells]
+        queued = {(chunk.chunk_x, chunk.chunk_y) for chunk in self.poi_spawn_queue}
+        distances = {}
+        for key in self.chunks:
+            if key in self.viewed_keys or key in queued:
+                continue
+            distance = min(max(abs(key[0] - x), abs(key[1] - y)) for x, y in centers)
+            if distance > RENDER_DISTANCE + 1:
+                distances[key] = distance
+        # Evict down to three quarters of the budget so this does not run every frame
+        for key in sorted(distances, key=distances.get, reverse=True):
+            if self.memory_used <= CHUNK_MEMORY_BUDGET * 0.75:
+                break
+            chunk = self.chunks.pop(key)
+            self.memory_used -= chunk.charged_bytes
+            self.evicted[key] = ChunkDelta(chunk)
+            self.revision += 1
+    
+    def get_chunk_or_delta(self, chunk_x, chunk_y):
+        """Generated chunk or the ChunkDelta of an evicted one (None if never generated); creates nothing"""
+        key = (chunk_x, chunk_y)
+        chunk = self.chunks.get(key)
+        return chunk if chunk is not None else self.evicted.get(key)
+    
+    def prefetch(self, player_cells):
+        """Queue generation of the chunks each cell's view range will sweep over along its velocity"""
+        step = min(CHUNK_SIZE) / 2
+        wanted = set()
+        for cell in player_cells:
+            velocity = getattr(cell, 'velocity', None)
+            if not velocity:
+                continue
+            center = cell.center
+            ahead = velocity * CHUNK_PREFETCH_SECONDS
+            samples = int(ahead.length() // step) + 1
+            for i in range(1, samples + 1):
+                center_x, center_y = self.get_chunk_coords(center + ahead * (i / samples))
+                for dx in range(-CELL_VIEW_RANGE, CELL_VIEW_RANGE + 1):
+                    for dy in range(-CELL_VIEW_RANGE, CELL_VIEW_RANGE + 1):
+                        wanted.add((center_x + dx, center_y + dy))
+        for key in wanted:
+            if key not in self.chunks and key not in self.pending:
+                self.request_chunk(*key)
+    
+    def get_existing_chunks_near(self, world_pos, radius):
+        """Already generated chunks overlapping the square of half-size radius (world units) around world_pos"""
+        x, y = world_pos
+        min_x, min_y = self.get_chunk_coords((x - radius, y - radius))
+        max_x, max_y = self.get_chunk_coords((x + radius, y + radius))
+        chunks = []
+        for chunk_x in range(min_x, max_x + 1):
+            for chunk_y in range(min_y, max_y + 1):
+                chunk = self.chunks.get((chunk_x, chunk_y))
+                if chunk is not None:
+                    chunks.append(chunk)
+        return chunks
     
     def get_chunks_in_range(self, center_world_pos, radius):
         """Get all chunks within radius of center position"""
@@ -240,33 +471,57 @@ class WorldGenerator:
         return chunks
     
     def update_chunk_discovery(self, player_cells):
-        """Update chunk discovery states based on player cell positions"""
+        """Update chunk discovery states based on player cell positions.
         
-        # First, reset all previously viewed chunks to discovered state
-        # (they maintain discovery but lose cell-viewed status)
-        for chunk in self.chunks.values():
-            if chunk.state == ChunkState.CELL_VIEWED:
-                chunk.state = ChunkState.DISCOVERED
+        Works on the difference between the chunks in view last call and now,
+        so only chunks entering or leaving a cell's CELL_VIEW_RANGE window are
+        touched. Returns (entered, discovered): the chunks that came into view
+        and, among them, those seen for the first time.
         
-        # Now process each player cell
+        Chunks still being generated are requested and left out of view until
+        a later call finds them ready, so this never waits on the worker pool.
+        """
+        self.collect_generated()
+        in_view = set()
         for cell in player_cells:
-            center_pos = cell.center
-            
-            # Get chunks in view range
-            nearby_chunks = self.get_chunks_in_range(center_pos, CELL_VIEW_RANGE)
-            for chunk in nearby_chunks:
-                # If undiscovered, mark as discovered first and spawn POI entities
-                if chunk.state == ChunkState.UNDISCOVERED:
-                    chunk.state = ChunkState.DISCOVERED
-                    # Spawn POI entities when chunk is first discovered
-                    if hasattr(chunk, 'poi_type') and chunk.poi_type:
-                        chunk.spawn_poi_entities()
-                # Then mark as currently cell-viewed (highest priority)
-                chunk.state = ChunkState.CELL_VIEWED
+            center_x, center_y = self.get_chunk_coords(cell.center)
+            for dx in range(-CELL_VIEW_RANGE, CELL_VIEW_RANGE + 1):
+                for dy in range(-CELL_VIEW_RANGE, CELL_VIEW_RANGE + 1):
+                    in_view.add((center_x + dx, center_y + dy))
+        
+        # Chunks leaving view keep their discovery but lose cell-viewed status
+        for key in self.viewed_keys - in_view:
+            chunk = self.chunks.get(key)
+            if chunk is not None and chunk.state == ChunkState.CELL_VIEWED:
+                chunk.state = ChunkState.DISCOVERED
+        
+        entered, discovered = [], []
+        for key in in_view - self.viewed_keys:
+            chunk = self.request_chunk(*key)
+            if chunk is None:
+                in_view.discard(key)  # Entered once generated
+                continue
+            # If undiscovered, mark as discovered first and spawn POI entities
+            if chunk.state == ChunkState.UNDISCOVERED:
+                discovered.append(chunk)
+                if chunk.poi_type:
+                    chunk.spawn_poi_entities()
+            # Then mark as currently cell-viewed (highest priority)
+            chunk.state = ChunkState.CELL_VIEWED
+            entered.append(chunk)
+        self.viewed_keys = in_view
+        return entered, discovered
     
     def get_chunks_around_camera(self, camera_pos, radius):
-        """Get chunks around camera position for rendering"""
-        return self.get_chunks_in_range(camera_pos, radius)
+        """Get generated chunks around camera position for rendering (missing ones are queued, not built)"""
+        center_chunk_x, center_chunk_y = self.get_chunk_coords(camera_pos)
+        chunks = []
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                chunk = self.request_chunk(center_chunk_x + dx, center_chunk_y + dy)
+                if chunk is not None:
+                    chunks.append(chunk)
+        return chunks
     
     def is_within_world_bounds(self, world_pos):
         """Check if position is within the playable world bounds"""
@@ -275,10 +530,8 @@ class WorldGenerator:
                 -WORLD_BOUNDS[1]/2 <= y <= WORLD_BOUNDS[1]/2)
     
     def get_biome_at_position(self, world_pos):
-        """Get biome at given world position"""
-        chunk_x, chunk_y = self.get_chunk_coords(world_pos)
-        chunk = self.get_chunk(chunk_x, chunk_y)
-        return chunk.biome
+        """Get biome at given world position (does not create the chunk)"""
+        return self.chunk_biome(*self.get_chunk_coords(world_pos))
 
 class WorldMap:
     """Manages the overall world state and chunk tracking"""
@@ -287,32 +540,45 @@ class WorldMap:
         self.world_generator = WorldGenerator(seed)
         self.discovered_chunks = set()  # (chunk_x, chunk_y) tuples
         self.viewed_chunks = set()  # (chunk_x, chunk_y) tuples
+        self.newly_discovered = []  # Chunks discovered during the last update
+        self._visible_range = None  # Chunk range last seen by get_visible_chunks
+        self._visible_chunks = []  # Generated chunks in that range
+        self._visible_revision = -1  # world_generator.revision when _visible_chunks was built
+        self._overlay_layer = None  # Reused SRCALPHA surface holding the composited world overlay
+        self._overlay_key = None  # (colors key, zoom) the layer was drawn for
+        self._overlay_colors_key = None  # (chunk range, center chunk, chunk states) of _overlay_chunk_colors
+        self._overlay_chunk_colors = []  # (column, row, RGBA) per chunk in that range with a visible color
+        self._overlay_size = (0, 0)  # Part of the layer in use
+        self._overlay_colors = {}  # (state, biome, out of bounds) -> composited RGBA
         
     def update(self, player_cells, all_entities):
         """Update world state based on player positions"""
-        # Update chunk discovery
-        self.world_generator.update_chunk_discovery(player_cells)
-        
-        # Update entity positions in chunks
-        for chunk in self.world_generator.chunks.values():
-            chunk.update_entities(all_entities)
+        # Update chunk discovery (only chunks entering or leaving view are touched)
+        entered, self.newly_discovered = self.world_generator.update_chunk_discovery(player_cells)
+        self.world_generator.prefetch(player_cells)
+        self.world_generator.evict_far_chunks(player_cells)
         
         # Track discovered and viewed chunks
-        for chunk in self.world_generator.chunks.values():
+        for chunk in entered:
             key = (chunk.chunk_x, chunk.chunk_y)
-            if chunk.state == ChunkState.DISCOVERED:
-                self.discovered_chunks.add(key)
-            elif chunk.state == ChunkState.CELL_VIEWED:
-                self.viewed_chunks.add(key)
-                self.discovered_chunks.add(key)  # Viewed chunks are also discovered
+            self.viewed_chunks.add(key)
+            self.discovered_chunks.add(key)  # Viewed chunks are also discovered
+        
+        # Update entity positions in chunks (only entities that changed chunk move)
+        self.world_generator.update_entity_index(all_entities)
     
     def get_chunk_at_world_pos(self, world_pos):
-        """Get chunk at given world position"""
+        """Get chunk at given world position (blocks on generation; for tools and tests)"""
         chunk_x, chunk_y = self.world_generator.get_chunk_coords(world_pos)
         return self.world_generator.get_chunk(chunk_x, chunk_y)
     
+    def request_chunk_at_world_pos(self, world_pos):
+        """Chunk at given world position if generated, else None after queueing it (never blocks)"""
+        chunk_x, chunk_y = self.world_generator.get_chunk_coords(world_pos)
+        return self.world_generator.request_chunk(chunk_x, chunk_y)
+    
     def get_molecules_in_discovered_chunks(self):
-        """Get all molecules from discovered chunks"""
+        """Get all molecules from discovered chunks (as entities, built on demand)"""
         from world_generation import ChunkState
         molecules = []
         for chunk in self.world_generator.chunks.values():
@@ -320,97 +586,146 @@ class WorldMap:
                 molecules.extend(chunk.molecules)
         return molecules
     
+    def get_molecule_records(self, chunk_range=None):
+        """Live molecule records (see molecule.MOLECULE_DTYPE) of discovered chunks.
+        
+        chunk_range (min_x, max_x, min_y, max_y) limits the query to those chunks.
+        """
+        chunks = (self.world_generator.chunks.values() if chunk_range is None
+                  else self.get_chunks_in_chunk_range(*chunk_range))
+        return concat_records(chunk.molecules for chunk in chunks if chunk.state != ChunkState.UNDISCOVERED)
+    
+    def get_chunks_in_chunk_range(self, min_chunk_x, max_chunk_x, min_chunk_y, max_chunk_y):
+        """Already generated chunks with coordinates inside the inclusive range (none are created)"""
+        chunks = self.world_generator.chunks
+        area = (max_chunk_x - min_chunk_x + 1) * (max_chunk_y - min_chunk_y + 1)
+        if area > len(chunks):
+            # Zoomed far out: cheaper to filter the generated chunks than to probe every cell of the range
+            return [chunk for (x, y), chunk in chunks.items()
+                    if min_chunk_x <= x <= max_chunk_x and min_chunk_y <= y <= max_chunk_y]
+        found = []
+        for chunk_x in range(min_chunk_x, max_chunk_x + 1):
+            for chunk_y in range(min_chunk_y, max_chunk_y + 1):
+                chunk = chunks.get((chunk_x, chunk_y))
+                if chunk is not None:
+                    found.append(chunk)
+        return found
+    
+    def get_visible_chunks(self, camera, view_size):
+        """Discovered chunks intersecting the camera's world rectangle.
+        
+        The chunk list is cached and only rebuilt when the view crosses a
+        chunk boundary (or chunks have been generated or evicted).
+        """
+        width, height = view_size
+        min_chunk_x, min_chunk_y = self.world_generator.get_chunk_coords(camera.screen_to_world((0, 0)))
+        max_chunk_x, max_chunk_y = self.world_generator.get_chunk_coords(camera.screen_to_world((width, height)))
+        chunk_range = (min_chunk_x, max_chunk_x, min_chunk_y, max_chunk_y)
+        if chunk_range != self._visible_range or self.world_generator.revision != self._visible_revision:
+            self._visible_range = chunk_range
+            self._visible_chunks = self.get_chunks_in_chunk_range(*chunk_range)
+            self._visible_revision = self.world_generator.revision
+        return [chunk for chunk in self._visible_chunks if chunk.state != ChunkState.UNDISCOVERED]
+    
+    def get_visible_molecule_records(self, camera, view_size):
+        """Live molecule records of the discovered chunks in the camera's view"""
+        return concat_records(chunk.molecules for chunk in self.get_visible_chunks(camera, view_size))
+    
     def get_biome_overlay_color(self, world_pos):
         """Get the biome overlay color for a world position"""
         biome_name = self.world_generator.get_biome_at_position(world_pos)
         return BIOMES[biome_name]["color"]
     
-    def render_world_boundaries(self, surface, camera):
-        """Render red zone outside world boundaries"""
-        # Get screen boundaries
-        screen_rect = surface.get_rect()
-        
-        # Convert world bounds to screen coordinates
-        world_bounds_rect = pygame.Rect(
-            -WORLD_BOUNDS[0]//2, -WORLD_BOUNDS[1]//2, 
-            WORLD_BOUNDS[0], WORLD_BOUNDS[1]
-        )
-        
-        # Convert to screen coordinates
-        top_left = camera.world_to_screen((world_bounds_rect.left, world_bounds_rect.top))
-        bottom_right = camera.world_to_screen((world_bounds_rect.right, world_bounds_rect.bottom))
+    def render_world_overlay(self, surface, camera):
+        """Render the red zone, chunk discovery shading and biome tint as one layer.
         
-        bounds_screen_rect = pygame.Rect(
-            top_left[0], top_left[1],
-            bottom_right[0] - top_left[0], bottom_right[1] - top_left[1]
-        )
+        The layer covers the chunks intersecting the screen. Each chunk's
+        composited color is only looked up again when that chunk range or one
+        of those chunks' state changes; a zoom change just refills the layer,
+        one fill per chunk at the exact zoom. Otherwise the frame costs a
+        single blit.
+        """
+        generator = self.world_generator
+        width, height = surface.get_size()
+        min_chunk_x, min_chunk_y = generator.get_chunk_coords(camera.screen_to_world((0, 0)))
+        max_chunk_x, max_chunk_y = generator.get_chunk_coords(camera.screen_to_world((width, height)))
+        center_chunk = generator.get_chunk_coords(camera.pos)
+        chunks = generator.chunks
+        states = tuple(getattr(chunks.get((chunk_x, chunk_y)), 'state', None)
+                       for chunk_x in range(min_chunk_x, max_chunk_x + 1)
+                       for chunk_y in range(min_chunk_y, max_chunk_y + 1))
+        key = (min_chunk_x, max_chunk_x, min_chunk_y, max_chunk_y, center_chunk, states)
+        if key != self._overlay_colors_key:
+            self._overlay_chunk_colors = self._chunk_overlay_colors(center_chunk, min_chunk_x, max_chunk_x, min_chunk_y, max_chunk_y)
+            self._overlay_colors_key = key
+            self._overlay_key = None
+        if (key, camera.zoom) != self._overlay_key:
+            self._fill_overlay(camera.zoom, max_chunk_x - min_chunk_x + 1, max_chunk_y - min_chunk_y + 1)
+            self._overlay_key = (key, camera.zoom)
         
-        # Create red zone overlay surface
-        red_overlay = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
-        red_overlay.fill(MAP_RED_ZONE_COLOR)
-        
-        # Cut out the world bounds area (make it transparent)
-        if bounds_screen_rect.colliderect(screen_rect):
-            # Clip the bounds rect to screen
-            clipped_bounds = bounds_screen_rect.clip(screen_rect)
-            pygame.draw.rect(red_overlay, (0, 0, 0, 0), clipped_bounds)
-        
-        surface.blit(red_overlay, (0, 0))
+        origin = camera.world_to_screen((min_chunk_x * CHUNK_SIZE[0], min_chunk_y * CHUNK_SIZE[1]))
+        surface.blit(self._overlay_layer, (round(origin[0]), round(origin[1])), pygame.Rect((0, 0), self._overlay_size))
+    
+    def _chunk_overlay_colors(self, center_chunk, min_chunk_x, max_chunk_x, min_chunk_y, max_chunk_y):
+        """(column, row, RGBA) of every chunk in the range with a visible overlay color"""
+        generator = self.world_generator
+        center_chunk_x, center_chunk_y = center_chunk
+        colors = []
+        for i, chunk_x in enumerate(range(min_chunk_x, max_chunk_x + 1)):
+            for j, chunk_y in enumerate(range(min_chunk_y, max_chunk_y + 1)):
+                if abs(chunk_x - center_chunk_x) <= RENDER_DISTANCE and abs(chunk_y - center_chunk_y) <= RENDER_DISTANCE:
+                    # Chunks still being generated cannot have been discovered yet
+                    chunk = generator.request_chunk(chunk_x, chunk_y)
+                    state = chunk.state if chunk is not None else ChunkState.UNDISCOVERED
+                    biome = chunk.biome if chunk is not None else None
+                else:
+                    state = biome = None  # Beyond render distance only the red zone is drawn
+                center = ((chunk_x + 0.5) * CHUNK_SIZE[0], (chunk_y + 0.5) * CHUNK_SIZE[1])
+                color = self._overlay_color(state, biome, not generator.is_within_world_bounds(center))
+                if color[3]:
+                    colors.append((i, j, color))
+        return colors
     
-    def render_chunk_backgrounds(self, surface, camera):
-        """Render chunk backgrounds based on discovery state"""
-        chunks_to_render = self.world_generator.get_chunks_around_camera(
-            camera.pos, RENDER_DISTANCE
-        )
+    def _fill_overlay(self, zoom, columns, rows):
+        """Redraw the overlay layer at the given zoom: one fill per chunk with its cached color"""
+        chunk_w, chunk_h = CHUNK_SIZE[0] * zoom, CHUNK_SIZE[1] * zoom
+        # Chunk edges are rounded from their exact positions so neighbours never leave gaps
+        edges_x = [round(i * chunk_w) for i in range(columns + 1)]
+        edges_y = [round(j * chunk_h) for j in range(rows + 1)]
+        size = (edges_x[-1], edges_y[-1])
         
-        for chunk in chunks_to_render:
-            # Get chunk screen rect
-            world_rect = chunk.world_rect
-            top_left = camera.world_to_screen((world_rect.left, world_rect.top))
-            bottom_right = camera.world_to_screen((world_rect.right, world_rect.bottom))
-            
-            # Add 1 pixel to width and height to prevent floating point gaps
-            screen_rect = pygame.Rect(
-                int(top_left[0]), int(top_left[1]),
-                int(bottom_right[0] - top_left[0]) + 1, int(bottom_right[1] - top_left[1]) + 1
-            )
-            
-            # Only render if on screen
-            if screen_rect.colliderect(surface.get_rect()):
-                # Choose background color based on chunk state
-                if chunk.state == ChunkState.UNDISCOVERED:
-                    bg_color = MAP_UNDISCOVERED_COLOR  # Black
-                elif chunk.state == ChunkState.DISCOVERED:
-                    bg_color = MAP_DISCOVERED_COLOR    # Dark gray
-                else:  # ChunkState.CELL_VIEWED
-                    continue  # No background overlay for cell-viewed (use normal background)
-                
-                # Fill the chunk area with the appropriate color
-                chunk_surface = pygame.Surface((screen_rect.width, screen_rect.height), pygame.SRCALPHA)
-                chunk_surface.fill(bg_color + (200,))  # Add alpha for overlay effect
-                surface.blit(chunk_surface, screen_rect.topleft)
-
-    def render_biome_overlay(self, surface, camera):
-        """Render biome overlays for visible chunks"""
-        chunks_to_render = self.world_generator.get_chunks_around_camera(
-            camera.pos, RENDER_DISTANCE
-        )
+        layer = self._overlay_layer
+        if layer is None or layer.get_width() < size[0] or layer.get_height() < size[1]:
+            # Grow only; a smaller view reuses part of the existing surface
+            capacity = (max(size[0], layer.get_width() if layer else 0), max(size[1], layer.get_height() if layer else 0))
+            layer = self._overlay_layer = pygame.Surface(capacity, pygame.SRCALPHA)
+        layer.fill((0, 0, 0, 0), pygame.Rect((0, 0), size))
+        self._overlay_size = size
         
-        for chunk in chunks_to_render:
-            if chunk.state != ChunkState.UNDISCOVERED:
-                # Get chunk screen rect
-                world_rect = chunk.world_rect
-                top_left = camera.world_to_screen((world_rect.left, world_rect.top))
-                bottom_right = camera.world_to_screen((world_rect.right, world_rect.bottom))
-                
-                screen_rect = pygame.Rect(
-                    top_left[0], top_left[1],
-                    bottom_right[0] - top_left[0], bottom_right[1] - top_left[1]
-                )
-                
-                # Only render if on screen
-                if screen_rect.colliderect(surface.get_rect()):
-                    biome_color = BIOMES[chunk.biome]["color"]
-                    overlay = pygame.Surface((screen_rect.width, screen_rect.height), pygame.SRCALPHA)
-                    overlay.fill(biome_color)
-                    surface.blit(overlay, screen_rect.topleft)
\ No newline at end of file
+        for i, j, color in self._overlay_chunk_colors:
+            layer.fill(color, pygame.Rect(edges_x[i], edges_y[j], edges_x[i + 1] - edges_x[i], edges_y[j + 1] - edges_y[j]))
+    
+    def _overlay_color(self, state, biome, out_of_bounds):
+        """Single RGBA equivalent to drawing red zone, state shading and biome tint on top of each other"""
+        key = (state, biome, out_of_bounds)
+        color = self._overlay_colors.get(key)
+        if color is None:
+            layers = []
+            if out_of_bounds:
+                layers.append(MAP_RED_ZONE_COLOR)
+            if state == ChunkState.UNDISCOVERED:
+                layers.append(MAP_UNDISCOVERED_COLOR + (200,))  # Black
+            elif state == ChunkState.DISCOVERED:
+                layers.append(MAP_DISCOVERED_COLOR + (200,))    # Dark gray
+            # No shading for cell-viewed chunks (use normal background)
+            if state is not None and state != ChunkState.UNDISCOVERED:
+                layers.append(BIOMES[biome]["color"])
+            # "Over" compositing with premultiplied channels
+            alpha, premultiplied = 0.0, [0.0, 0.0, 0.0]
+            for r, g, b, a in layers:
+                a /= 255.0
+                premultiplied = [c * a + p * (1.0 - a) for c, p in zip((r, g, b), premultiplied)]
+                alpha = a + alpha * (1.0 - a)
+            color = tuple(round(p / alpha) for p in premultiplied) + (round(alpha * 255),) if alpha else (0, 0, 0, 0)
+            self._overlay_colors[key] = color
+        return color
\ No newline at end of file